@@ -0,0 +1,58 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from announcements.utils import build_announcement_messages, deliver_announcement
+
+BACKENDS = {
+    "locmem": "django.core.mail.backends.locmem.EmailBackend",
+    "file": "django.core.mail.backends.filebased.EmailBackend",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks announcement fan-out: one connection per message against "
+        "batched delivery over a single reused connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--backend", choices=BACKENDS, default="locmem")
+        parser.add_argument(
+            "--file-path",
+            default="/tmp/col-bench-mail",
+            help="Output directory for the file backend.",
+        )
+
+    def handle(self, *args, **options):
+        recipients = [
+            (f"student{i}@example.com", f"Student{i}")
+            for i in range(options["recipients"])
+        ]
+        with override_settings(
+            EMAIL_BACKEND=BACKENDS[options["backend"]],
+            EMAIL_FILE_PATH=options["file_path"],
+            ANNOUNCEMENT_EMAIL_BATCH_SIZE=options["batch_size"],
+            ANNOUNCEMENT_EMAILS_PER_SECOND=0,
+        ):
+            started = time.perf_counter()
+            for message in build_announcement_messages("bench", "Body", recipients):
+                message.send()  # opens and closes its own connection
+            naive = time.perf_counter() - started
+
+            started = time.perf_counter()
+            deliver_announcement(None, "bench", "Body", recipients, get_connection())
+            batched = time.perf_counter() - started
+
+        count = len(recipients)
+        self.stdout.write(f"backend={options['backend']} recipients={count}")
+        self.stdout.write(
+            f"connection per message: {naive:.3f}s ({count / naive:.0f} msg/s)"
+        )
+        self.stdout.write(
+            f"batched, reused connection: {batched:.3f}s ({count / batched:.0f} msg/s)"
+        )
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.4 on 2026-10-18 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("announcements", "0003_alter_announcement_recipient"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="announcement",
+            name="emails_failed",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="announcement",
+            name="emails_sent",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="announcement",
+            name="recipients_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
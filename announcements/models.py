@@ -16,6 +16,10 @@ class Announcement(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # Delivery progress, updated after every batch of emails is handed to the backend
+    recipients_count = models.PositiveIntegerField(default=0)
+    emails_sent = models.PositiveIntegerField(default=0)
+    emails_failed = models.PositiveIntegerField(default=0)
     
     def __str__(self):
         return self.title
\ No newline at end of file
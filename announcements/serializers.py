@@ -5,4 +5,5 @@ from .models import Announcement
 class AnnouncementSerializer(serializers.ModelSerializer):
     class Meta:
         model = Announcement
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+        read_only_fields = ("recipients_count", "emails_sent", "emails_failed")
\ No newline at end of file
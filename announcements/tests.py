@@ -1,3 +1,73 @@
-from django.test import TestCase
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from users.models import User
+
+from .models import Announcement
+from .utils import deliver_announcement
+
+
+class FlakyBackend(BaseEmailBackend):
+    """Fails the batches listed in `failing` and every open after `opens_left`."""
+
+    def __init__(self, failing=(), opens_left=None):
+        super().__init__()
+        self.failing = set(failing)
+        self.opens_left = opens_left
+        self.batches = 0
+        self.is_open = False
+
+    def open(self):
+        if self.opens_left is not None:
+            if self.opens_left == 0:
+                raise ConnectionError("SMTP server unavailable")
+            self.opens_left -= 1
+        self.is_open = True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, messages):
+        assert self.is_open
+        self.batches += 1
+        if self.batches in self.failing:
+            raise ConnectionError("connection dropped")
+        return len(messages)
+
+
+@override_settings(ANNOUNCEMENT_EMAIL_BATCH_SIZE=2)
+class DeliverAnnouncementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        announcer = User.objects.create(email="admin@example.com")
+        cls.announcement = Announcement.objects.create(
+            title="Title", content="Content", announcer=announcer
+        )
+        cls.recipients = [(f"student-{i}@example.com", "Ade") for i in range(5)]
+
+    def deliver(self, connection):
+        deliver_announcement(
+            self.announcement.pk, "Title", "Content", self.recipients, connection
+        )
+        self.announcement.refresh_from_db()
+
+    def test_delivery_carries_on_over_a_reopened_connection(self):
+        with self.assertLogs("announcements.utils", "ERROR"):
+            self.deliver(FlakyBackend(failing={1}))
+        self.assertEqual(self.announcement.emails_sent, 3)
+        self.assertEqual(self.announcement.emails_failed, 2)
+
+    def test_failed_open_counts_unsent_emails(self):
+        with self.assertRaises(ConnectionError):
+            self.deliver(FlakyBackend(opens_left=0))
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.emails_sent, 0)
+        self.assertEqual(self.announcement.emails_failed, 5)
+
+    def test_failed_reopen_counts_unsent_emails(self):
+        with self.assertLogs("announcements.utils", "ERROR"):
+            with self.assertRaises(ConnectionError):
+                self.deliver(FlakyBackend(failing={2}, opens_left=1))
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.emails_sent, 2)
+        self.assertEqual(self.announcement.emails_failed, 3)
@@ -1,8 +1,147 @@
-from core.utils import EmailThread
+import logging
+import threading
+import time
 
-def send_announcement_email(title, message, recipients):
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+
+from core.utils import render_email, render_emails
+
+from .models import Announcement
+
+logger = logging.getLogger(__name__)
+
+
+def chunked(items, size):
+    """Yields successive lists of at most `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_announcement_messages(title, content, recipients):
+    """
+    Builds the messages for an announcement from (email, first_name) pairs.
+
+    Each recipient gets their own, personalised message so addresses are never
+    exposed to other recipients. If ANNOUNCEMENT_EMAIL_BCC_CHUNK_SIZE is set,
+    recipients are instead grouped into BCC-only messages of that size.
+    """
     subject = f"Announcement: {title}"
-    body = message
-    html_message=None
-    recipient_list = [recipient.email for recipient in recipients]
-    EmailThread(subject, body, html_message, recipient_list).start()
\ No newline at end of file
+    from_email = f"Circle of Learning MSSNUI <{settings.DEFAULT_FROM_EMAIL}>"
+    context = {"title": title, "content": content}
+    bcc_chunk_size = settings.ANNOUNCEMENT_EMAIL_BCC_CHUNK_SIZE
+
+    if bcc_chunk_size > 0:
+        body, html_message = render_email("announcement", context)
+        emails = (email for email, _ in recipients)
+        for chunk in chunked(emails, bcc_chunk_size):
+            message = EmailMultiAlternatives(
+                subject=subject, body=body, from_email=from_email, bcc=chunk
+            )
+            message.attach_alternative(html_message, "text/html")
+            yield message
+        return
+
+    rendered = render_emails(
+        "announcement",
+        ((email, {"first_name": first_name}) for email, first_name in recipients),
+        context,
+    )
+    for email, body, html_message in rendered:
+        message = EmailMultiAlternatives(
+            subject=subject, body=body, from_email=from_email, to=[email]
+        )
+        message.attach_alternative(html_message, "text/html")
+        yield message
+
+
+def _open_connection(connection, announcement_id):
+    """Opens the connection, counting every unsent email as failed if it cannot."""
+    try:
+        connection.open()
+    except Exception:
+        Announcement.objects.filter(pk=announcement_id).update(
+            emails_failed=F("recipients_count") - F("emails_sent")
+        )
+        raise
+
+
+def deliver_announcement(
+    announcement_id, title, content, recipients, connection=None
+):
+    """
+    Sends an announcement over a single reused connection in fixed-size batches.
+
+    Progress is recorded on the announcement after every batch, and batches are
+    paced to ANNOUNCEMENT_EMAILS_PER_SECOND recipients when it is set. A failing
+    batch is logged and counted, and delivery carries on with the next one over
+    a fresh connection. If a connection cannot be opened, the emails not sent
+    yet are counted as failed and the error is raised.
+    """
+    batch_size = settings.ANNOUNCEMENT_EMAIL_BATCH_SIZE
+    rate = settings.ANNOUNCEMENT_EMAILS_PER_SECOND
+    connection = connection or get_connection(fail_silently=False)
+    messages = build_announcement_messages(title, content, recipients)
+
+    Announcement.objects.filter(pk=announcement_id).update(
+        recipients_count=len(recipients), emails_sent=0, emails_failed=0
+    )
+    try:
+        _open_connection(connection, announcement_id)
+        for batch in chunked(messages, batch_size):
+            started = time.monotonic()
+            batch_recipients = sum(len(message.recipients()) for message in batch)
+            try:
+                connection.send_messages(batch)
+                sent, failed = batch_recipients, 0
+            except Exception:
+                logger.exception(
+                    "Announcement %s: failed to send a batch of %d messages",
+                    announcement_id,
+                    len(batch),
+                )
+                sent, failed = 0, batch_recipients
+
+            Announcement.objects.filter(pk=announcement_id).update(
+                emails_sent=F("emails_sent") + sent,
+                emails_failed=F("emails_failed") + failed,
+            )
+            if failed:
+                connection.close()
+                _open_connection(connection, announcement_id)
+
+            if rate > 0:
+                # In BCC mode one message carries many recipients
+                remaining = batch_recipients / rate - (time.monotonic() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+    finally:
+        connection.close()
+
+
+class AnnouncementEmailThread(threading.Thread):
+    def __init__(self, announcement_id, title, content, recipients):
+        self.announcement_id = announcement_id
+        self.title = title
+        self.content = content
+        self.recipients = recipients
+        threading.Thread.__init__(self)
+
+    def run(self):
+        deliver_announcement(
+            self.announcement_id, self.title, self.content, self.recipients
+        )
+
+
+def send_announcement_email(announcement, recipients):
+    recipient_list = list(recipients.values_list("email", "first_name"))
+    AnnouncementEmailThread(
+        announcement.pk, announcement.title, announcement.content, recipient_list
+    ).start()
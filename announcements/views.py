@@ -28,7 +28,7 @@ class AnnouncementListCreateView(generics.ListCreateAPIView):
         self.perform_create(serializer)
         data = serializer.data
         recipients = User.objects.filter(user_type=data['recipient'])
-        send_announcement_email(data['title'], data['content'], recipients)
+        send_announcement_email(serializer.instance, recipients)
         headers = self.get_success_headers(serializer.data)
         response = {
             "success": True,
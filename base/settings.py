@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 
 from pathlib import Path
 
@@ -71,8 +71,18 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Email templates are rendered for every recipient of an announcement,
+            # so compiled templates are always kept in memory.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                )
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -115,6 +125,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# New passwords are hashed with the first hasher; the rest only verify existing
+# hashes, which are upgraded to the first hasher on the user's next login.
+PASSWORD_HASHERS = {
+    "argon2": [
+        "users.hashers.ConfigurableArgon2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    ],
+    "pbkdf2": [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "users.hashers.ConfigurableArgon2PasswordHasher",
+    ],
+}[config("PASSWORD_HASHER", default="argon2")] + [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+ARGON2_TIME_COST = config("ARGON2_TIME_COST", default=2, cast=int)
+ARGON2_MEMORY_COST = config("ARGON2_MEMORY_COST", default=19456, cast=int)  # KiB
+ARGON2_PARALLELISM = config("ARGON2_PARALLELISM", default=1, cast=int)
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -140,6 +170,39 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The throttle cache is per process by default; point it at a shared backend
+# (e.g. Redis) to enforce the auth throttles across workers.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "throttle": {
+        "BACKEND": config(
+            "THROTTLE_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("THROTTLE_CACHE_LOCATION", default="throttle"),
+    },
+    # Must not evict entries; see users.revocation
+    "revocation": {
+        "BACKEND": config(
+            "REVOCATION_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("REVOCATION_CACHE_LOCATION", default="revocation"),
+        "OPTIONS": {
+            "MAX_ENTRIES": config(
+                "REVOCATION_CACHE_MAX_ENTRIES", default=1_000_000, cast=int
+            ),
+        },
+    },
+}
+THROTTLE_CACHE_ALIAS = "throttle"
+REVOCATION_CACHE_ALIAS = "revocation"
+
 # Email settings
 EMAIL_BACKEND = config(
     "EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
@@ -151,13 +214,43 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = config("EMAIL_USE_TLS")
 EMAIL_PORT = config("EMAIL_PORT")
 
+# Announcement fan-out: messages handed to the backend per connection round,
+# optional BCC chunking (0 sends one message per recipient) and a send rate cap
+# (0 disables the cap).
+ANNOUNCEMENT_EMAIL_BATCH_SIZE = config(
+    "ANNOUNCEMENT_EMAIL_BATCH_SIZE", default=100, cast=int
+)
+ANNOUNCEMENT_EMAIL_BCC_CHUNK_SIZE = config(
+    "ANNOUNCEMENT_EMAIL_BCC_CHUNK_SIZE", default=0, cast=int
+)
+ANNOUNCEMENT_EMAILS_PER_SECOND = config(
+    "ANNOUNCEMENT_EMAILS_PER_SECOND", default=0, cast=float
+)
+
+# Bulk user actions: the most ids a request may list, which is also the
+# number of users changed per UPDATE, keeping statements under the database's
+# bound-variable limit.
+BULK_USER_ACTION_BATCH_SIZE = config(
+    "BULK_USER_ACTION_BATCH_SIZE", default=500, cast=int
+)
+
 REST_FRAMEWORK = {
     # YOUR SETTINGS
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "core.utils.custom_exception_handler",
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
+    # Token buckets for login, password reset and verification emails (see
+    # core.throttling): capacity/refill period
+    "DEFAULT_THROTTLE_RATES": {
+        "auth_ip": config("AUTH_IP_THROTTLE_RATE", default="20/min"),
+        "auth_email": config("AUTH_EMAIL_THROTTLE_RATE", default="5/min"),
+    },
+    # Trusted reverse proxies in front of the app. Throttles key on REMOTE_ADDR
+    # when 0, and otherwise on the X-Forwarded-For address this many hops back;
+    # never on the raw header, which clients can forge.
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -169,19 +262,41 @@ SPECTACULAR_SETTINGS = {
 }
 
 # AUTHLIB SETTINGS
+# Seconds to keep a provider's signing keys when it sends no max-age
+OAUTH_JWKS_TTL = config("OAUTH_JWKS_TTL", default=3600, cast=int)
+OAUTH_HTTP_TIMEOUT = config("OAUTH_HTTP_TIMEOUT", default=10, cast=int)
+OAUTH_HTTP_POOL_SIZE = config("OAUTH_HTTP_POOL_SIZE", default=10, cast=int)
+
+# The endpoints can be pointed at a local stub server (see run_google_stub).
 AUTHLIB_OAUTH_CLIENTS = {
     "google": {
-        "client_id": config("GOOGLE_CLIENT_ID"),
-        "client_secret": config("GOOGLE_CLIENT_SECRET"),
-        "authorize_url": "https://accounts.google.com/o/oauth2/auth",
+        "client_id": config("GOOGLE_CLIENT_ID", default=""),
+        "client_secret": config("GOOGLE_CLIENT_SECRET", default=""),
+        "authorize_url": config(
+            "GOOGLE_AUTHORIZE_URL", default="https://accounts.google.com/o/oauth2/auth"
+        ),
         "authorize_params": None,
-        "access_token_url": "https://accounts.google.com/o/oauth2/token",
+        "access_token_url": config(
+            "GOOGLE_TOKEN_URL", default="https://accounts.google.com/o/oauth2/token"
+        ),
         "access_token_params": None,
         "refresh_token_url": None,
         "client_kwargs": {
             "scope": "openid profile email",
+            "default_timeout": OAUTH_HTTP_TIMEOUT,
         },
-        "jwks_uri": "https://www.googleapis.com/oauth2/v3/certs",
+        "jwks_uri": config(
+            "GOOGLE_JWKS_URI", default="https://www.googleapis.com/oauth2/v3/certs"
+        ),
+        "userinfo_endpoint": config(
+            "GOOGLE_USERINFO_URL",
+            default="https://www.googleapis.com/oauth2/v2/userinfo",
+        ),
+        "issuers": config(
+            "GOOGLE_ISSUERS",
+            default="https://accounts.google.com,accounts.google.com",
+            cast=Csv(),
+        ),
     }
 }
 
@@ -195,7 +310,42 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 PAYSTACK_SECRET_KEY = config("PAYSTACK_SECRET_KEY")
 
+# The class level whose students graduate on promotion (see core.promotion);
+# 0 means the highest level any class has
+FINAL_CLASS_LEVEL = config("FINAL_CLASS_LEVEL", default=0, cast=int)
+
+# Upper bound, in seconds, on how long a process keeps serving the previous
+# active academic session after another process activates a new one (see
+# core.active_session)
+ACTIVE_SESSION_CACHE_SECONDS = config(
+    "ACTIVE_SESSION_CACHE_SECONDS", default=30, cast=int
+)
+
+# Seconds an authenticated user row is served from cache before being reloaded;
+# with the per-process default cache, also how long other workers may keep
+# serving a user after they are deactivated (see users.authentication)
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=60, cast=int)
+
+# How long email verification and password reset (or invite) links stay valid
+ACTION_TOKEN_LIFETIMES = {
+    "verify": timedelta(
+        hours=config("VERIFY_EMAIL_TOKEN_LIFETIME_HOURS", default=24, cast=int)
+    ),
+    "reset": timedelta(
+        hours=config("RESET_PASSWORD_TOKEN_LIFETIME_HOURS", default=24, cast=int)
+    ),
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
-}
\ No newline at end of file
+    # Every refresh returns a new refresh token and revokes the one it was given
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+}
+
+# Upper bound, in seconds, on how long a per-process cache can miss refresh
+# token revocations made by other processes (see users.revocation)
+REVOCATION_CACHE_SYNC_SECONDS = config(
+    "REVOCATION_CACHE_SYNC_SECONDS", default=60, cast=int
+)
@@ -0,0 +1,78 @@
+"""
+The active academic session, cached per process.
+
+Nearly every request that records results, courses or payments needs the
+current session, so each process keeps it in memory alongside the value of a
+version key in the default cache. A read costs one cache lookup; the session
+is reloaded when the version changes, which the AcademicSession signals do on
+every save and delete (see core.signals), and at least every
+ACTIVE_SESSION_CACHE_SECONDS. The version key expires after that time too,
+so with a per-process cache backend other workers see a new active session
+within ACTIVE_SESSION_CACHE_SECONDS; with a shared backend (e.g. Redis) they
+see it on their next read.
+"""
+
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import AcademicSession
+
+VERSION_KEY = "core:active-session:version"
+
+_cached = {"version": None, "session": None, "expires": 0}
+_lock = threading.Lock()
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Cold or evicted cache: agree on a new version with other processes
+        cache.add(
+            VERSION_KEY,
+            uuid.uuid4().hex,
+            timeout=settings.ACTIVE_SESSION_CACHE_SECONDS,
+        )
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_active_session():
+    """
+    Returns the active AcademicSession, or None when there is none.
+
+    The instance is shared by every thread of the process; do not modify it.
+    """
+    version = _current_version()
+    with _lock:
+        if _cached["version"] == version and time.monotonic() < _cached["expires"]:
+            return _cached["session"]
+    # The version is read before the row, so a change made in between only
+    # causes one extra reload. The row is a single partial unique index lookup.
+    try:
+        session = AcademicSession.objects.get(is_active=True)
+    except AcademicSession.DoesNotExist:
+        session = None
+    with _lock:
+        _cached["version"] = version
+        _cached["session"] = session
+        _cached["expires"] = time.monotonic() + settings.ACTIVE_SESSION_CACHE_SECONDS
+    return session
+
+
+def get_active_session_id():
+    session = get_active_session()
+    return session.pk if session else None
+
+
+def invalidate_active_session():
+    """Makes every process reload the active session on its next read."""
+    with _lock:
+        _cached["version"] = None
+        _cached["session"] = None
+    cache.set(
+        VERSION_KEY, uuid.uuid4().hex, timeout=settings.ACTIVE_SESSION_CACHE_SECONDS
+    )
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.template.loader import get_template
+
+from core.utils import render_emails
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks per-recipient email rendering: parsing the template for every "
+        "recipient against render_emails with cached, precompiled templates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=5000)
+        parser.add_argument("--template", default="announcement")
+
+    def handle(self, *args, **options):
+        name = options["template"]
+        count = options["recipients"]
+        context = {"title": "Bench", "content": "Line one\n\nLine two"}
+        recipients = [
+            (f"student{i}@example.com", {"first_name": f"Student{i}"})
+            for i in range(count)
+        ]
+        sources = [
+            get_template(f"emails/{name}.{ext}").template.source
+            for ext in ("txt", "html")
+        ]
+
+        started = time.perf_counter()
+        for _, recipient_context in recipients:
+            for source in sources:
+                Template(source).render(Context({**context, **recipient_context}))
+        parsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in render_emails(name, recipients, context):
+            pass
+        cached = time.perf_counter() - started
+
+        self.stdout.write(f"template=emails/{name} recipients={count}")
+        self.stdout.write(
+            f"parse per recipient: {parsed:.3f}s ({count / parsed:.0f} emails/s)"
+        )
+        self.stdout.write(
+            f"render_emails (cached): {cached:.3f}s ({count / cached:.0f} emails/s)"
+        )
@@ -0,0 +1,66 @@
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures project startup by running `python -X importtime manage.py check` "
+        "in fresh interpreters. Reports the total import time and the packages "
+        "that cost the most."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--command",
+            default="check",
+            help="The manage.py command whose startup is measured.",
+        )
+
+    def handle(self, *args, **options):
+        totals = []
+        per_package = defaultdict(list)
+        for _ in range(options["runs"]):
+            total, packages = self.measure(options["command"])
+            totals.append(total)
+            for package, micros in packages.items():
+                per_package[package].append(micros)
+
+        self.stdout.write(
+            f"`manage.py {options['command']}` imports: "
+            f"median={statistics.median(totals) / 1000:.0f}ms "
+            f"min={min(totals) / 1000:.0f}ms over {len(totals)} runs"
+        )
+        ranked = sorted(
+            per_package.items(), key=lambda item: statistics.median(item[1]), reverse=True
+        )
+        for package, timings in ranked[: options["top"]]:
+            self.stdout.write(f"  {statistics.median(timings) / 1000:8.1f}ms  {package}")
+
+    def measure(self, command):
+        """Returns the total self time and the self time per top-level package, in µs."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "manage.py", command],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total = 0
+        packages = defaultdict(int)
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                self_time = int(match.group(1))
+                total += self_time
+                packages[match.group(4).split(".")[0]] += self_time
+        return total, packages
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from core.promotion import promote_classes
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the students of every class to the class one level up, creating "
+        "the classes that are missing, and graduates (deactivates) the students "
+        "of the final level, in one transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would move without changing anything.",
+        )
+        parser.add_argument(
+            "--final-level",
+            type=int,
+            help="The level that graduates; defaults to FINAL_CLASS_LEVEL.",
+        )
+
+    def handle(self, *args, **options):
+        report = promote_classes(
+            final_level=options["final_level"], dry_run=options["dry_run"]
+        )
+        for move in report["moves"]:
+            if move["graduates"]:
+                target = "graduate"
+            else:
+                target = f"{move['successor_name']} (level {move['class_level'] + 1}"
+                target += ", new)" if move["successor"] is None else ")"
+            self.stdout.write(
+                f"{move['name']} (level {move['class_level']}): "
+                f"{move['students']} students -> {target}"
+            )
+        summary = (
+            "Would promote {students_promoted} students, graduate {students_graduated} "
+            "(final level {final_level}) and create {classes_created} classes."
+            if options["dry_run"]
+            else "Promoted {students_promoted} students, graduated {students_graduated} "
+            "(final level {final_level}) and created {classes_created} classes."
+        )
+        self.stdout.write(summary.format(**report))
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.4 on 2026-10-19 00:06
+
+from django.db import migrations, models
+
+
+def keep_latest_active_session(apps, schema_editor):
+    """Leaves only the newest active session active, so the constraint can be added."""
+    AcademicSession = apps.get_model("core", "AcademicSession")
+    latest = AcademicSession.objects.filter(is_active=True).order_by("-pk").first()
+    if latest is not None:
+        AcademicSession.objects.filter(is_active=True).exclude(pk=latest.pk).update(
+            is_active=False
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_academicsession"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_active_session, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="academicsession",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)),
+                fields=("is_active",),
+                name="unique_active_academic_session",
+            ),
+        ),
+    ]
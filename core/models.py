@@ -1,17 +1,42 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 
 
 class AcademicSession(models.Model):
     name = models.CharField(max_length=50)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        constraints = [
+            # At most one active session; doubles as the index that finds it
+            models.UniqueConstraint(
+                fields=["is_active"],
+                condition=Q(is_active=True),
+                name="unique_active_academic_session",
+            )
+        ]
+
     def __str__(self):
         return f"{self.name} ACADEMIC SESSION"
 
     def save(self, *args, **kwargs):
-        if self.is_active:
-            AcademicSession.objects.filter(is_active=True).update(is_active=False)
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self.is_active:
+                # Lock every session (there is one a year) so that concurrent
+                # activations queue up instead of racing
+                list(AcademicSession.objects.select_for_update().values_list("pk"))
+                AcademicSession.objects.filter(is_active=True).exclude(
+                    pk=self.pk
+                ).update(is_active=False)
+            super().save(*args, **kwargs)
+
+    def activate(self):
+        """Makes this the only active session, in one transaction."""
+        self.is_active = True
+        if self.pk is None:
+            self.save()
+        else:
+            self.save(update_fields=["is_active"])
 
 
 class Class(models.Model):
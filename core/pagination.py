@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key.
+
+    Each page is fetched with `WHERE id < <cursor> ORDER BY id DESC LIMIT n`,
+    so a page costs the same no matter how deep into the listing it is.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-pk"
+
+    def get_paginated_data(self, data):
+        """Returns the page and its links in the API's response envelope shape."""
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
@@ -0,0 +1,136 @@
+"""
+Promotion of every class's students to the next class level.
+
+Each class is mapped to its successor: the class one level up whose name is
+the class's name with its level number bumped ("Level 1 A" -> "Level 2 A"),
+or the same name when it has no level number in it. Missing successors are
+created in bulk with the same tutor, every student is moved with a single
+UPDATE and the students of the final level graduate: their accounts are
+deactivated and they leave their class.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BigIntegerField, Case, Count, F, When
+
+from users.authentication import invalidate_cached_users
+from users.models import StudentProfile, User
+from users.revocation import revoke_user_tokens
+
+from .models import Class
+
+
+def successor_name(student_class):
+    level = student_class.class_level
+    return re.sub(
+        rf"(?<!\d){level}(?!\d)", str(level + 1), student_class.name, count=1
+    )
+
+
+def plan_promotion(classes, final_level):
+    """
+    Maps each class with students to its successor, or to None when its
+    students graduate. Each of `classes` must carry its student_count.
+    """
+    by_key = {(c.name, c.class_level): c for c in classes}
+    plan = []
+    for student_class in classes:
+        if not student_class.student_count:
+            continue
+        if student_class.class_level >= final_level:
+            plan.append((student_class, None))
+            continue
+        key = (successor_name(student_class), student_class.class_level + 1)
+        successor = by_key.get(key)
+        if successor is None:
+            successor = by_key[key] = Class(
+                name=key[0],
+                class_level=key[1],
+                class_tutor_id=student_class.class_tutor_id,
+            )
+        plan.append((student_class, successor))
+    return plan
+
+
+def new_successors(plan):
+    """The successors in the plan that do not exist yet, each once."""
+    new = {id(s): s for _, s in plan if s is not None and s.pk is None}
+    return list(new.values())
+
+
+def promotion_report(plan, final_level, created):
+    moves = [
+        {
+            "class": student_class.id,
+            "name": student_class.name,
+            "class_level": student_class.class_level,
+            "students": student_class.student_count,
+            "successor": successor.id if successor else None,
+            "successor_name": successor.name if successor else None,
+            "graduates": successor is None,
+        }
+        for student_class, successor in plan
+    ]
+    return {
+        "final_level": final_level,
+        "classes_created": len(created),
+        "students_promoted": sum(m["students"] for m in moves if not m["graduates"]),
+        "students_graduated": sum(m["students"] for m in moves if m["graduates"]),
+        "moves": moves,
+    }
+
+
+@transaction.atomic
+def promote_classes(final_level=None, dry_run=False):
+    """
+    Promotes the students of every class and returns a report of the moves.
+
+    `final_level` defaults to FINAL_CLASS_LEVEL, or to the highest class level
+    when that is unset. With `dry_run` nothing is written; successors that
+    would be created are reported with a null id.
+    """
+    # Lock the classes so concurrent edits cannot change the plan under us
+    locked = list(Class.objects.select_for_update().order_by("class_level", "name"))
+    counts = dict(
+        StudentProfile.objects.filter(student_class__isnull=False)
+        .values_list("student_class")
+        .annotate(Count("pk"))
+    )
+    for student_class in locked:
+        student_class.student_count = counts.get(student_class.pk, 0)
+    final_level = (
+        final_level
+        or settings.FINAL_CLASS_LEVEL
+        or max((c.class_level for c in locked), default=0)
+    )
+    plan = plan_promotion(locked, final_level)
+    created = new_successors(plan)
+    if dry_run:
+        return promotion_report(plan, final_level, created)
+
+    Class.objects.bulk_create(created)
+
+    graduating = [c.pk for c, successor in plan if successor is None]
+    graduate_ids = list(
+        StudentProfile.objects.filter(student_class__in=graduating).values_list(
+            "user_id", flat=True
+        )
+    )
+    # One statement, so a student moved into a class is not moved again with it
+    StudentProfile.objects.filter(student_class__in=[c.pk for c, _ in plan]).update(
+        student_class=Case(
+            *(
+                When(student_class=c.pk, then=successor.pk if successor else None)
+                for c, successor in plan
+            ),
+            default=F("student_class"),
+            output_field=BigIntegerField(),
+        )
+    )
+    if graduate_ids:
+        User.objects.filter(pk__in=graduate_ids).update(is_active=False)
+        revoke_user_tokens(graduate_ids)
+        transaction.on_commit(lambda: invalidate_cached_users(graduate_ids))
+    return promotion_report(plan, final_level, created)
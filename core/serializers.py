@@ -1,14 +1,83 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.validators import UniqueValidator
 
 from users.models import StudentProfile, TutorProfile
+from .active_session import get_active_session
 from .models import Class, AcademicSession
 
 
+def roster_prefetch():
+    """Prefetches each class's students with just the user fields ClassSerializer shows."""
+    return Prefetch(
+        "students",
+        queryset=StudentProfile.objects.select_related("user").only(
+            "student_class_id",
+            "user__id",
+            "user__first_name",
+            "user__last_name",
+            "user__email",
+        ),
+    )
+
+
+class ActiveSessionDefault:
+    """
+    Defaults an academic_session field to the active session when creating,
+    so clients can omit it. Fails validation when no session is active.
+
+    On updates (DRF also applies defaults to full updates) a record keeps the
+    session it has.
+    """
+
+    requires_context = True
+
+    def __call__(self, serializer_field):
+        instance = serializer_field.parent.instance
+        if instance is not None:
+            return getattr(instance, serializer_field.source)
+        session = get_active_session()
+        if session is None:
+            raise ValidationError("No academic session is active; provide one.")
+        return session
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class ClassSummarySerializer(serializers.ModelSerializer):
+    """A class without its roster; expects class_tutor to be select_related."""
+
+    class_tutor = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Class
+        fields = ("id", "name", "class_level", "class_tutor")
+
+    def get_class_tutor(self, instance):
+        tutor = instance.class_tutor
+        return {
+            "id": tutor.id,
+            "first_name": tutor.first_name,
+            "last_name": tutor.last_name,
+            "email": tutor.email,
+        }
+
+
+class ClassListSerializer(ClassSummarySerializer):
+    """A class summary with its number of students; expects student_count annotated."""
+
+    student_count = serializers.IntegerField(read_only=True)
+
+    class Meta(ClassSummarySerializer.Meta):
+        fields = ClassSummarySerializer.Meta.fields + ("student_count",)
+
+
 class ClassSerializer(serializers.ModelSerializer):
     name = serializers.CharField()
     class_tutor = serializers.PrimaryKeyRelatedField(
@@ -18,6 +87,9 @@ class ClassSerializer(serializers.ModelSerializer):
     student_ids = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
     )
+    remove_student_ids = serializers.ListField(
+        child=serializers.IntegerField(), write_only=True, required=False
+    )
 
     class Meta:
         model = Class
@@ -29,32 +101,72 @@ class ClassSerializer(serializers.ModelSerializer):
         return value
 
     def validate_student_ids(self, student_ids):
-        if student_ids is not None:
-            for student_id in student_ids:
-                student = StudentProfile.objects.filter(user=student_id).first()
-                if student is None:
-                    raise ValidationError(
-                        f"Student with ID {student_id} does not have a profile"
-                    )
+        """Checks every ID has a student profile, in one query."""
+        student_ids = set(student_ids)
+        found = set(
+            StudentProfile.objects.filter(user_id__in=student_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+        missing = sorted(student_ids - found)
+        if missing:
+            raise ValidationError(f"Students with IDs {missing} do not have a profile")
+        return student_ids
+
+    def validate_remove_student_ids(self, student_ids):
+        """Checks every ID belongs to a student of this class, in one query."""
+        student_ids = set(student_ids)
+        if self.instance is None:
+            if student_ids:
+                raise ValidationError("A new class has no students to remove")
+            return student_ids
+        found = set(
+            self.instance.students.filter(user_id__in=student_ids).values_list(
+                "user_id", flat=True
+            )
+        )
+        missing = sorted(student_ids - found)
+        if missing:
+            raise ValidationError(f"Students with IDs {missing} are not in this class")
         return student_ids
 
     def validate(self, attrs):
-        # I should validate if the class tutor being submitted has is_staff=True
-        student_ids = attrs.get("student_ids", None)
-        if student_ids is not None:
-            attrs["students_ids"] = self.validate_student_ids(student_ids)
+        both = attrs.get("student_ids", set()) & attrs.get("remove_student_ids", set())
+        if both:
+            raise ValidationError(
+                f"Students with IDs {sorted(both)} cannot be both added and removed"
+            )
         return attrs
 
+    def assign_students(self, instance, student_ids, remove_student_ids):
+        """
+        Moves the students into the class, from whichever class they were in,
+        and takes the removed ones out of it, with one UPDATE each. Profiles
+        deleted since validation are simply skipped.
+        """
+        if student_ids:
+            StudentProfile.objects.filter(user_id__in=student_ids).update(
+                student_class=instance
+            )
+        if remove_student_ids:
+            StudentProfile.objects.filter(
+                user_id__in=remove_student_ids, student_class=instance
+            ).update(student_class=None)
+
+    @transaction.atomic
+    def create(self, validated_data):
+        student_ids = validated_data.pop("student_ids", None)
+        validated_data.pop("remove_student_ids", None)
+        instance = super().create(validated_data)
+        self.assign_students(instance, student_ids, None)
+        return instance
+
+    @transaction.atomic
     def update(self, instance, validated_data):
-        student_ids = validated_data.pop(
-            "student_ids", None
-        )  # for bulk assignment of students to class
-        if student_ids is not None:
-            for student_id in student_ids:
-                # student = get_user_model().objects.filter(id=student_id).first()
-                student = StudentProfile.objects.filter(user=student_id).first()
-                student.student_class = instance
-                student.save()
+        # for bulk assignment of students to, or removal from, the class
+        student_ids = validated_data.pop("student_ids", None)
+        remove_student_ids = validated_data.pop("remove_student_ids", None)
+        self.assign_students(instance, student_ids, remove_student_ids)
         instance.name = validated_data.get("name", instance.name)
         instance.class_tutor = validated_data.get("class_tutor", instance.class_tutor)
         instance.class_level = validated_data.get("class_level", instance.class_level)
@@ -63,8 +175,8 @@ class ClassSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
-        class_students = StudentProfile.objects.filter(student_class=instance)
-        print(class_students)
+        # A no-op when the view already prefetched the roster
+        prefetch_related_objects([instance], roster_prefetch())
         rep["students"] = [
             {
                 "id": student.user.id,  # the user_id
@@ -72,7 +184,7 @@ class ClassSerializer(serializers.ModelSerializer):
                 "last_name": student.user.last_name,
                 "email": student.user.email,
             }
-            for student in class_students
+            for student in instance.students.all()
         ]
         return rep
 
@@ -110,4 +222,11 @@ class AcademicSessionSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Academic session must be consecutive years"
             )
-        return value
\ No newline at end of file
+        return value
+
+
+class PromotionSerializer(serializers.Serializer):
+    """Options for promoting every class's students to the next level."""
+
+    dry_run = serializers.BooleanField(default=False)
+    final_level = serializers.IntegerField(required=False, min_value=1)
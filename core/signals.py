@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .active_session import invalidate_active_session
+from .models import AcademicSession
+
+
+@receiver(post_save, sender=AcademicSession)
+@receiver(post_delete, sender=AcademicSession)
+def invalidate_cached_active_session(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_active_session)
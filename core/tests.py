@@ -1,3 +1,50 @@
 from django.test import TestCase
+from rest_framework.test import APIRequestFactory
 
-# Create your tests here.
+from users.enums import UserTypes
+from users.models import StudentProfile, User
+
+from .models import Class
+from .views import ClassListCreateAPIView, ClassRetrieveUpdateDestroyAPIView
+
+
+class ClassQueryCountTests(TestCase):
+    """The class endpoints run the same number of queries however big they get."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tutor = User.objects.create(
+            email="tutor@example.com", user_type=UserTypes.TUTOR, is_staff=True
+        )
+
+    def add_classes(self, count, students):
+        classes = Class.objects.bulk_create(
+            Class(name=f"Class {i}", class_tutor=self.tutor, class_level=1)
+            for i in range(count)
+        )
+        for student_class in classes:
+            users = User.objects.bulk_create(
+                User(email=f"student-{student_class.pk}-{i}@example.com")
+                for i in range(students)
+            )
+            StudentProfile.objects.bulk_create(
+                StudentProfile(user=user, student_class=student_class)
+                for user in users
+            )
+        return classes
+
+    def test_class_list_queries_do_not_grow_with_classes(self):
+        view = ClassListCreateAPIView.as_view()
+        for count in (2, 20):
+            self.add_classes(count, students=5)
+            with self.assertNumQueries(1):
+                response = view(APIRequestFactory().get("/"))
+            self.assertEqual(len(response.data["data"]), Class.objects.count())
+
+    def test_class_detail_queries_do_not_grow_with_roster(self):
+        view = ClassRetrieveUpdateDestroyAPIView.as_view()
+        for students in (2, 50):
+            (student_class,) = self.add_classes(1, students=students)
+            with self.assertNumQueries(2):
+                response = view(APIRequestFactory().get("/"), pk=student_class.pk)
+            self.assertEqual(len(response.data["data"]["students"]), students)
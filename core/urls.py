@@ -3,11 +3,21 @@ from . import views
 
 urlpatterns = [
     path("classes/", views.ClassListCreateAPIView.as_view(), name="classes"),
+    path(
+        "classes/promote/",
+        views.PromoteClassesView.as_view(),
+        name="promote-classes",
+    ),
     path(
         "classes/<int:pk>/",
         views.ClassRetrieveUpdateDestroyAPIView.as_view(),
         name="class-detail",
     ),
+    path(
+        "classes/<int:pk>/students/",
+        views.ClassStudentListView.as_view(),
+        name="class-students",
+    ),
     path(
         "academic-sessions/",
         views.ListCreateAcademicSession.as_view(),
@@ -18,4 +28,14 @@ urlpatterns = [
         views.RetrieveUpdateDestroyAcademicSession.as_view(),
         name="retieve-update-destroy-academi-session",
     ),
+    path(
+        "academic-sessions/<int:pk>/activate/",
+        views.ActivateAcademicSession.as_view(),
+        name="activate-academic-session",
+    ),
+    path(
+        "metrics/throttles/",
+        views.ThrottleMetricsView.as_view(),
+        name="throttle-metrics",
+    ),
 ]
@@ -1,13 +1,21 @@
+import logging
 import threading
 
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
+from django.db import transaction
+from django.template import Context
+from django.template.loader import get_template
 
 from rest_framework.views import exception_handler
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+BULK_EMAIL_BATCH_SIZE = 100
 
 def format_drf_errors(errors):
     formatted_errors = []
@@ -26,6 +34,24 @@ def format_drf_errors(errors):
 
     return formatted_errors
 
+def parse_bool_param(params, name):
+    """
+    Reads an optional boolean query parameter.
+
+    Returns None when the parameter is absent and raises a ValidationError for
+    anything other than true/false/1/0.
+    """
+    value = params.get(name)
+    if value is None:
+        return None
+    value = value.lower()
+    if value in ("true", "1"):
+        return True
+    if value in ("false", "0"):
+        return False
+    raise ValidationError({name: "Must be true or false."})
+
+
 # TODO: Reformat the errors to be consistent with the rest of the API
 
 def custom_exception_handler(exc, context):
@@ -50,11 +76,80 @@ class EmailThread(threading.Thread):
         threading.Thread.__init__(self)
 
     def run(self):
-        send_mail(
-            subject=self.subject,
-            message=self.message,
-            from_email=f"Circle of Learning MSSNUI <{settings.DEFAULT_FROM_EMAIL}>",
-            html_message=self.html_message,
-            recipient_list=self.recipients,
-            fail_silently=False,
-        )
+        try:
+            send_mail(
+                subject=self.subject,
+                message=self.message,
+                from_email=f"Circle of Learning MSSNUI <{settings.DEFAULT_FROM_EMAIL}>",
+                html_message=self.html_message,
+                recipient_list=self.recipients,
+                fail_silently=False,
+            )
+        except Exception:
+            logger.exception("Failed to send %r to %s", self.subject, self.recipients)
+
+
+def dispatch_email(subject: str, message: str, html_message: str, recipients: list):
+    """
+    Sends an email in the background once the current transaction commits.
+
+    The request never waits on SMTP, and an email is never sent for a write that
+    ends up rolled back. Outside a transaction the email is dispatched immediately.
+    """
+    transaction.on_commit(
+        lambda: EmailThread(subject, message, html_message, recipients).start()
+    )
+
+
+class BulkEmailThread(threading.Thread):
+    """Sends prebuilt messages in batches over a single reused connection."""
+
+    def __init__(self, messages: list):
+        self.messages = messages
+        threading.Thread.__init__(self)
+
+    def run(self):
+        connection = get_connection(fail_silently=False)
+        try:
+            for start in range(0, len(self.messages), BULK_EMAIL_BATCH_SIZE):
+                batch = self.messages[start : start + BULK_EMAIL_BATCH_SIZE]
+                try:
+                    connection.send_messages(batch)
+                except Exception:
+                    logger.exception("Failed to send a batch of %d emails", len(batch))
+                    connection.close()  # the next batch reopens a fresh connection
+        finally:
+            connection.close()
+
+
+def dispatch_bulk_email(messages: list):
+    """Like dispatch_email, for many prebuilt EmailMessage objects at once."""
+    transaction.on_commit(lambda: BulkEmailThread(messages).start())
+
+
+def get_email_templates(name: str):
+    """Returns the compiled plain-text and HTML templates for `emails/<name>`."""
+    return get_template(f"emails/{name}.txt"), get_template(f"emails/{name}.html")
+
+
+def render_email(name: str, context: dict):
+    """Renders the plain-text and HTML bodies of `emails/<name>`."""
+    text, html = get_email_templates(name)
+    return text.render(context).strip(), html.render(context)
+
+
+def render_emails(name: str, recipients, context: dict = None):
+    """
+    Renders `emails/<name>` for each (email, recipient_context) pair in `recipients`.
+
+    The templates are looked up once and a single Context is reused, with each
+    recipient's values pushed on top of the shared `context`, so a large fan-out
+    only pays for rendering. Yields (email, text, html) tuples.
+    """
+    text, html = get_email_templates(name)
+    shared = Context(context or {})
+    for email, recipient_context in recipients:
+        with shared.push(recipient_context):
+            yield email, text.template.render(shared).strip(), html.template.render(
+                shared
+            )
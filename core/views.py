@@ -1,18 +1,56 @@
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from django.db.models import Count, F
+from django.shortcuts import get_object_or_404
+
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.generics import (
+    ListAPIView,
+    ListCreateAPIView,
+    RetrieveUpdateDestroyAPIView,
+)
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from .serializers import ClassSerializer, AcademicSessionSerializer
+from users.models import StudentProfile
+from users.serializers import StudentProfileListSerializer
+
+from .pagination import IdCursorPagination
+from .serializers import (
+    ClassListSerializer,
+    ClassSerializer,
+    AcademicSessionSerializer,
+    PromotionSerializer,
+    roster_prefetch,
+)
 from .models import Class, AcademicSession
-from .permissions import IsStaffUser
+from .permissions import IsAdminUser, IsStaffUser
+from .promotion import promote_classes
+from .throttling import get_throttle_metrics
 
 
 class ClassListCreateAPIView(ListCreateAPIView):
+    """
+    Lists classes as summaries, with their tutor and number of students, in a
+    single query; rosters are served by ClassStudentListView.
+    """
+
     serializer_class = ClassSerializer
     queryset = Class.objects.all()
     # permission_classes = [IsAuthenticated, IsStaffUser]
 
+    def get_queryset(self):
+        if self.request.method == "GET":
+            return Class.objects.select_related("class_tutor").annotate(
+                student_count=Count("students")
+            )
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.request.method == "GET":
+            return ClassListSerializer
+        return super().get_serializer_class()
+
     def post(self, request, *args, **kwargs):
         data = super().post(request, *args, **kwargs)
         response = {
@@ -34,7 +72,7 @@ class ClassListCreateAPIView(ListCreateAPIView):
 
 class ClassRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     serializer_class = ClassSerializer
-    queryset = Class.objects.all()
+    queryset = Class.objects.prefetch_related(roster_prefetch())
     # permission_classes = [IsAuthenticated, IsStaffUser]
 
     def get(self, request, *args, **kwargs):
@@ -62,12 +100,15 @@ class ClassRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
     def patch(self, request, *args, **kwargs):
         """
         This endpoint partially updates a class. It only updates the fields that are provided in the request data.
-        for convenience, it accept a list of student_ids and assigns all of them to the class.
+        for convenience, it accept a list of student_ids and assigns all of them to the class,
+        moving them out of any class they were in, and a list of remove_student_ids to take
+        out of the class.
 
         Example:
         {
             "name": "level 1",
-            "student_ids": [1, 2, 3]
+            "student_ids": [1, 2, 3],
+            "remove_student_ids": [4]
         }
         """
         data = super().patch(request, *args, **kwargs)
@@ -94,6 +135,77 @@ class ClassRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         return Response(response, status=status.HTTP_204_NO_CONTENT)
 
 
+class ClassStudentListView(ListAPIView):
+    """
+    A page of one class's students, with their names and emails.
+
+    Supports `search` (name, email or matric number), `ordering` (last_name,
+    first_name, matric_no, level; prefix with - to reverse) and `page_size`.
+
+    Example:
+    GET /classes/3/students/?search=ade&ordering=last_name
+    """
+
+    serializer_class = StudentProfileListSerializer
+    permission_classes = [IsStaffUser]
+    pagination_class = IdCursorPagination
+    filter_backends = [SearchFilter, OrderingFilter]
+    search_fields = ["user__first_name", "user__last_name", "user__email", "matric_no"]
+    ordering_fields = ["last_name", "first_name", "matric_no", "level"]
+    ordering = ["last_name"]
+
+    def get_queryset(self):
+        # Names are annotated so the cursor can read them off each profile
+        return (
+            StudentProfile.objects.filter(student_class=self.kwargs["pk"])
+            .select_related("user", "student_class")
+            .annotate(last_name=F("user__last_name"), first_name=F("user__first_name"))
+        )
+
+    def get(self, request, *args, **kwargs):
+        get_object_or_404(Class, pk=kwargs["pk"])
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = {
+            "success": True,
+            "message": "Class students retrieved successfully",
+            "data": self.paginator.get_paginated_data(serializer.data),
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class PromoteClassesView(APIView):
+    """
+    Moves the students of every class to the class one level up, creating the
+    classes that are missing, and graduates (deactivates) the final level, all
+    in one transaction. With dry_run, only reports what would move.
+
+    Example:
+    {
+        "dry_run": true,
+        "final_level": 4
+    }
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = PromotionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        report = promote_classes(**serializer.validated_data)
+        response = {
+            "success": True,
+            "message": (
+                "Promotion planned; nothing was changed"
+                if serializer.validated_data["dry_run"]
+                else "Classes promoted successfully"
+            ),
+            "data": report,
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+
 class ListCreateAcademicSession(ListCreateAPIView):
     """To create or list academic sessions"""
 
@@ -171,3 +283,38 @@ class RetrieveUpdateDestroyAcademicSession(RetrieveUpdateDestroyAPIView):
             }
             return Response(custom_resp, status=status.HTTP_200_OK)
         return Response(status=status.HTTP_200_OK)
+
+
+class ActivateAcademicSession(APIView):
+    """Makes a session the active one, deactivating the current one."""
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        session = get_object_or_404(AcademicSession, pk=kwargs["pk"])
+        session.activate()
+        response = {
+            "success": True,
+            "message": "Academic Session activated Successfully",
+            "data": AcademicSessionSerializer(session).data,
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class ThrottleMetricsView(APIView):
+    """
+    Counts of allowed and throttled requests per auth endpoint and bucket kind.
+
+    Counters live in the throttle cache, so they cover every worker only when
+    that cache is shared.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        response = {
+            "success": True,
+            "message": "Throttle metrics retrieved successfully",
+            "data": get_throttle_metrics(),
+        }
+        return Response(response, status=status.HTTP_200_OK)
@@ -1,10 +1,15 @@
 from rest_framework import serializers
 from .models import Course
 from core.models import AcademicSession, Class
+from core.serializers import ActiveSessionDefault
 from users.models import User
 
 
 class CourseSerializer(serializers.ModelSerializer):
+    academic_session = serializers.PrimaryKeyRelatedField(
+        queryset=AcademicSession.objects.all(), default=ActiveSessionDefault()
+    )
+
     class Meta:
         model = Course
         fields = [
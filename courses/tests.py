@@ -1,3 +1,59 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.active_session import invalidate_active_session
+from core.models import AcademicSession, Class
+from users.enums import UserTypes
+from users.models import User
+
+from .models import Course
+
+
+class CourseSessionDefaultTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tutor = User.objects.create(
+            email="tutor@example.com", user_type=UserTypes.TUTOR, is_staff=True
+        )
+        cls.student_class = Class.objects.create(
+            name="Level 1", class_tutor=cls.tutor, class_level=1
+        )
+        cls.old_session = AcademicSession.objects.create(name="2023/2024")
+
+    def setUp(self):
+        invalidate_active_session()
+
+    def course_data(self, code):
+        return {
+            "course_code": code,
+            "course_title": "Arabic",
+            "tutor": self.tutor.pk,
+            "class_name": self.student_class.pk,
+        }
+
+    def test_create_defaults_to_the_active_session(self):
+        response = APIClient().post(
+            "/api/v1/courses/courses/", self.course_data("ARB101"), format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["data"]["academic_session"], self.old_session.pk)
+
+    def test_full_update_keeps_the_course_session(self):
+        course = Course.objects.create(
+            course_code="ARB101",
+            course_title="Arabic",
+            tutor=self.tutor,
+            class_name=self.student_class,
+            academic_session=self.old_session,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            AcademicSession.objects.create(name="2024/2025").activate()
+
+        response = APIClient().put(
+            f"/api/v1/courses/courses/{course.pk}/",
+            self.course_data("ARB102"),
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        course.refresh_from_db()
+        self.assertEqual(course.academic_session, self.old_session)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .models import Payment, RegistrationPayment, FeeAmount
+from core.serializers import ActiveSessionDefault
 from users.models import User
 
 
@@ -105,12 +106,14 @@ class PaymentSerializer(serializers.ModelSerializer):
             "student",
             "amount",
             "purpose",
+            "academic_session",
             "reference",
             "status",
             "paid_at",
         ]
         read_only_fields = ["id", "paid_by", "paid_at"]
         extra_kwargs = {
+            "academic_session": {"default": ActiveSessionDefault()},
             "reference": {"required": False},
             "status": {"required": False},
             "paid_at": {"required": False},
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .models import Result
+from core.serializers import ActiveSessionDefault
 from users.models import User
 
 
@@ -17,6 +18,7 @@ class ResultSerializer(serializers.ModelSerializer):
             "student_class",
             "date_created",
         ]
+        extra_kwargs = {"academic_session": {"default": ActiveSessionDefault()}}
 
     def validate_student(self, value):
         """Ensure the associated user is of type student"""
@@ -47,7 +49,7 @@ class PartialResultSerializer(serializers.Serializer):
 class BulkResultUploadSerializer(serializers.Serializer):
     """For validation of the results i bulk upload"""
 
-    academic_session = serializers.IntegerField()
+    academic_session = serializers.IntegerField(required=False)
     semester = serializers.IntegerField()
     student_class = serializers.IntegerField()
     results = serializers.ListField(child=PartialResultSerializer())
@@ -19,4 +19,15 @@ urlpatterns = [
         views.ClassSemesterResultView.as_view(),
         name="course-result-detail",
     ),
+    # The same, for the active academic session
+    path(
+        "class/<str:class_id>/semester/<str:semester>/course/<str:course_id>",
+        views.CourseResultDetailView.as_view(),
+        name="active-session-course-result-detail",
+    ),
+    path(
+        "class/<str:class_id>/semester/<str:semester>/",
+        views.ClassSemesterResultView.as_view(),
+        name="active-session-class-semester-result",
+    ),
 ]
@@ -8,6 +8,8 @@ from rest_framework.exceptions import ValidationError
 
 from drf_spectacular.utils import extend_schema
 
+from core.active_session import get_active_session_id
+
 from .models import Result
 from .serializers import (
     ResultSerializer,
@@ -47,13 +49,13 @@ class BulkResultUpload(generics.CreateAPIView):
     )
     def post(self, request, *args, **kwargs):
         data = request.data
-        academic_session = data.get("academic_session", None)
+        academic_session = data.get("academic_session") or get_active_session_id()
         semester = data.get("semester", None)
         student_class = data.get("student_class")
         if not academic_session:
             custom_resp = {
                 "success": False,
-                "message": "Academic session not provided",
+                "message": "Academic session not provided and none is active",
                 "successful_uploads": 0,
             }
 
@@ -129,15 +131,17 @@ class BulkResultUpload(generics.CreateAPIView):
         return Response(custom_resp, status=status.HTTP_201_CREATED, headers=headers)
 
 
-class CourseResultDetailView(generics.RetrieveUpdateDestroyAPIView):
-    """Retrieves, update or delete results for a particular course"""
+class CourseResultDetailView(generics.RetrieveAPIView):
+    """Retrieves the results for a particular course"""
 
     # serializer_class = BulkResultUploadSerializer
 
     @extend_schema(responses=BulkResultViewResponseSerializer)
     def get(self, request, *args, **kwargs):
         """Gets all the results for a class"""
-        academic_session = kwargs.get("academic_session_id", None)
+        academic_session = (
+            kwargs.get("academic_session_id") or get_active_session_id()
+        )
         student_class = kwargs.get("class_id", None)
         semester = kwargs.get("semester", None)
         course = kwargs.get("course_id", None)
@@ -145,7 +149,7 @@ class CourseResultDetailView(generics.RetrieveUpdateDestroyAPIView):
         if not academic_session:
             custom_resp = {
                 "success": False,
-                "message": "Academic session not provided",
+                "message": "Academic session not provided and none is active",
             }
 
             return Response(custom_resp, status=status.HTTP_400_BAD_REQUEST)
@@ -195,17 +199,18 @@ class CourseResultDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 class ClassSemesterResultView(generics.RetrieveAPIView):
-
     def get(self, request, *args, **kwargs):
         """Gets a semester cumulative results for each student in a class"""
-        academic_session = kwargs.get("academic_session_id", None)
+        academic_session = (
+            kwargs.get("academic_session_id") or get_active_session_id()
+        )
         student_class = kwargs.get("class_id", None)
         semester = kwargs.get("semester", None)
 
         if not academic_session:
             custom_resp = {
                 "success": False,
-                "message": "Academic session not provided",
+                "message": "Academic session not provided and none is active",
                 "successful_uploads": 0,
             }
 
@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _version_key(user_id):
+    return f"auth:user-version:{user_id}"
+
+
+def get_user_cache_key(user_id):
+    """
+    Returns the cache key of the user's current cached row.
+
+    The key embeds a per-user version, so bumping the version orphans every
+    entry cached under the previous one.
+    """
+    version = cache.get(_version_key(user_id), 0)
+    return f"auth:user:{user_id}:v{version}"
+
+
+def invalidate_cached_user(user_id):
+    """Forces the next authenticated request of this user to reload it from the DB."""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 1, timeout=None)
+
+
+def invalidate_cached_users(user_ids):
+    """Bulk form of invalidate_cached_user."""
+    for user_id in user_ids:
+        invalidate_cached_user(user_id)
+
+
+def get_cached_user(user_id):
+    """
+    Returns the user from the cache, loading it on a miss, or None when it
+    does not exist. Inactive users are returned too.
+    """
+    key = get_user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TTL)
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that serves the user from a short-lived cache.
+
+    The user row is loaded from the database at most once per
+    AUTH_USER_CACHE_TTL seconds. Saving or deleting a user invalidates the
+    entry (see users.signals) in the default cache. With a shared default
+    cache, changes to is_active, user_type, is_staff or the password take
+    effect on the next request. With the default per-process cache, they
+    take effect at once in the process that made them, and other workers may
+    serve the old row for up to AUTH_USER_CACHE_TTL seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        key = get_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TTL)
+        return user
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the token claims alone, without touching the DB or cache.
+
+    request.user is a TokenUser exposing the claims added by
+    users.tokens.UserRefreshToken. They reflect the user row as of the last
+    refresh, so a demoted or deactivated user keeps their old roles for up to
+    ACCESS_TOKEN_LIFETIME. Only use this on read-only endpoints.
+    """
@@ -0,0 +1,151 @@
+"""
+A local stand-in for Google's OAuth endpoints, for tests and benchmarks.
+
+It implements just enough of the authorization code flow for the sign-in
+views: an authorize endpoint that redirects straight back with a code, a
+token endpoint that returns a signed ID token, the JWKS and userinfo
+endpoints. Point the GOOGLE_* URL settings at it to use it (see
+run_google_stub). Requests are counted per path, and new connections under
+"connections", so callers can check how many outbound calls a login makes.
+The commands that start it refuse to run unless DEBUG is on.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from authlib.jose import JsonWebKey, jwt
+
+KEY_ID = "stub-key"
+
+
+class GoogleStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, client_id, address=("127.0.0.1", 0), delay=0):
+        super().__init__(address, GoogleStubHandler)
+        self.client_id = client_id
+        self.delay = delay  # seconds added to every response, to mimic latency
+        self.key = JsonWebKey.generate_key("RSA", 2048, is_private=True)
+        self.key_set = {"keys": [{**self.key.as_dict(is_private=False), "kid": KEY_ID, "use": "sig"}]}
+        self.codes = {}
+        self.hits = Counter()
+        self._sequence = count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def issuer(self):
+        return self.url
+
+    def settings(self):
+        """Environment variables that point the app at this server."""
+        return {
+            "GOOGLE_AUTHORIZE_URL": f"{self.url}/authorize",
+            "GOOGLE_TOKEN_URL": f"{self.url}/token",
+            "GOOGLE_JWKS_URI": f"{self.url}/certs",
+            "GOOGLE_USERINFO_URL": f"{self.url}/userinfo",
+            "GOOGLE_ISSUERS": self.issuer,
+        }
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def issue_code(self, nonce):
+        with self._lock:
+            n = next(self._sequence)
+        code = f"code-{n}"
+        self.codes[code] = {
+            "sub": str(100000 + n),
+            "email": f"stub-user-{n}@example.com",
+            "email_verified": True,
+            "given_name": "Stub",
+            "family_name": f"User{n}",
+            "nonce": nonce,
+        }
+        return code
+
+    def id_token(self, profile):
+        now = int(time.time())
+        claims = {
+            "iss": self.issuer,
+            "aud": self.client_id,
+            "iat": now,
+            "exp": now + 3600,
+            **{key: value for key, value in profile.items() if value is not None},
+        }
+        return jwt.encode({"alg": "RS256", "kid": KEY_ID}, claims, self.key).decode()
+
+
+class GoogleStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+    def setup(self):
+        super().setup()
+        self.server.hits["connections"] += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.hits[url.path] += 1
+        if url.path == "/authorize":
+            code = self.server.issue_code(query.get("nonce"))
+            params = urlencode({"code": code, "state": query.get("state", "")})
+            self.respond(302, headers={"Location": f"{query['redirect_uri']}?{params}"})
+        elif url.path == "/certs":
+            self.respond(200, self.server.key_set, {"Cache-Control": "max-age=3600"})
+        elif url.path == "/userinfo":
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            profile = self.server.codes.get(token.removeprefix("access-"))
+            if profile:
+                self.respond(200, {k: v for k, v in profile.items() if k != "nonce"})
+            else:
+                self.respond(401, {"error": "invalid_token"})
+        else:
+            self.respond(404, {"error": "not_found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        self.server.hits[url.path] += 1
+        profile = self.server.codes.get(form.get("code"))
+        if url.path != "/token":
+            self.respond(404, {"error": "not_found"})
+        elif profile is None:
+            self.respond(400, {"error": "invalid_grant"})
+        else:
+            self.respond(
+                200,
+                {
+                    "access_token": f"access-{form['code']}",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                    "scope": "openid email profile",
+                    "id_token": self.server.id_token(profile),
+                },
+            )
+
+    def respond(self, status, body=None, headers=None):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
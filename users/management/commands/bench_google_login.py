@@ -0,0 +1,75 @@
+import time
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from users.google_stub import GoogleStubServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks Google sign-ins against a local stub server started on --port. "
+        "The GOOGLE_* settings must point at that port (see run_google_stub). "
+        "Reports callback latency and the outbound requests made per login. Runs "
+        "inside a transaction that is rolled back, and only with DEBUG on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=50)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--delay", type=float, default=0, help="Stub latency per response."
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError(
+                "The Google stub is for development only; run with DEBUG on."
+            )
+        google_config = settings.AUTHLIB_OAUTH_CLIENTS["google"]
+        server = GoogleStubServer(
+            google_config["client_id"],
+            address=("127.0.0.1", options["port"]),
+            delay=options["delay"],
+        )
+        if google_config["access_token_url"] != server.settings()["GOOGLE_TOKEN_URL"]:
+            server.server_close()
+            raise CommandError(
+                "The Google settings do not point at the stub. Export:\n"
+                + "\n".join(f"{k}={v}" for k, v in server.settings().items())
+            )
+        server.start()
+
+        timings, first_login = [], {}
+        with override_settings(ALLOWED_HOSTS=["*"]), transaction.atomic():
+            for _ in range(options["logins"]):
+                client = Client()
+                authorize_url = client.get(reverse("users:google-signin"))["Location"]
+                callback_url = requests.get(authorize_url, allow_redirects=False).headers[
+                    "Location"
+                ]
+                server.hits.clear()
+                started = time.perf_counter()
+                response = client.get(callback_url)
+                timings.append(time.perf_counter() - started)
+                if response.status_code != 302:
+                    self.stderr.write(f"Sign-in failed: {response.content!r}")
+                    break
+                if len(timings) == 1:
+                    first_login = dict(server.hits)
+            transaction.set_rollback(True)
+        server.shutdown()
+
+        timings.sort()
+        self.stdout.write(f"first login outbound: {first_login}")
+        self.stdout.write(f"last login outbound:  {dict(server.hits)}")
+        self.stdout.write(
+            f"{len(timings)} sign-ins, "
+            f"p50={timings[len(timings) // 2] * 1000:.1f}ms "
+            f"p99={timings[max(int(len(timings) * 0.99) - 1, 0)] * 1000:.1f}ms"
+        )
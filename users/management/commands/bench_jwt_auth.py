@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from users.authentication import CachedJWTAuthentication, StatelessJWTAuthentication
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks authenticating a request with simplejwt's JWTAuthentication, "
+        "the cached user lookup and stateless claims. Runs inside a transaction "
+        "that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email="bench-jwt-auth@example.com", password=None
+            )
+            access = user.get_tokens_for_user()["access"]
+            request = APIRequestFactory().get(
+                "/", HTTP_AUTHORIZATION=f"Bearer {access}"
+            )
+            for backend in (
+                JWTAuthentication(),
+                CachedJWTAuthentication(),
+                StatelessJWTAuthentication(),
+            ):
+                self.run_backend(backend, request, options["requests"])
+            transaction.set_rollback(True)
+
+    def run_backend(self, backend, request, count):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(count):
+                backend.authenticate(request)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{type(backend).__name__}: {elapsed / count * 1e6:.1f}us/request, "
+            f"{len(queries) / count:.3f} queries/request"
+        )
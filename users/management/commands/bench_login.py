@@ -0,0 +1,68 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from users.enums import UserTypes
+from users.models import User
+from users.views import StudentLoginView
+
+PASSWORD = "Str0ng-pass"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks student login through StudentLoginView. Users start with legacy "
+        "PBKDF2 hashes, so the first round measures logins that verify and rehash "
+        "them, and the second round measures logins against the configured hasher. "
+        "Runs inside a transaction that is rolled back and with throttling disabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=50)
+
+    def handle(self, *args, **options):
+        count = options["logins"]
+        view = StudentLoginView.as_view(throttle_classes=[])
+        factory = APIRequestFactory()
+        legacy_hash = make_password(PASSWORD, hasher="pbkdf2_sha256")
+
+        with override_settings(ALLOWED_HOSTS=["*"]), transaction.atomic():
+            users = User.objects.bulk_create(
+                User(
+                    email=f"bench-login-{i}@example.com",
+                    password=legacy_hash,
+                    user_type=UserTypes.STUDENT,
+                    is_verified=True,
+                    is_approved=True,
+                    paid_reg=True,
+                )
+                for i in range(count)
+            )
+            for label in ("legacy hash (verify + rehash)", "upgraded hash"):
+                timings = []
+                for user in users:
+                    request = factory.post(
+                        "/", {"email": user.email, "password": PASSWORD}, format="json"
+                    )
+                    started = time.perf_counter()
+                    response = view(request)
+                    timings.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        self.stderr.write(f"Login failed: {response.data}")
+                        break
+                self.report(label, timings)
+            transaction.set_rollback(True)
+
+    def report(self, label, timings):
+        timings.sort()
+        self.stdout.write(
+            f"{label}: hasher={settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]} "
+            f"{len(timings)} logins, "
+            f"p50={timings[len(timings) // 2] * 1000:.0f}ms "
+            f"p99={timings[max(int(len(timings) * 0.99) - 1, 0)] * 1000:.0f}ms"
+        )
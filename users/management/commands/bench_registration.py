@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from users.views import StudentRegisterView
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks student registration through StudentRegisterView with the "
+        "configured password hasher. Runs inside a transaction that is rolled back, "
+        "so no users are kept and no emails are sent."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--registrations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        count = options["registrations"]
+        view = StudentRegisterView.as_view()
+        factory = APIRequestFactory()
+        timings = []
+        with override_settings(ALLOWED_HOSTS=["*"]), transaction.atomic():
+            for i in range(count):
+                request = factory.post(
+                    "/",
+                    {"email": f"bench-register-{i}@example.com", "password": "Str0ng-pass"},
+                    format="json",
+                )
+                started = time.perf_counter()
+                response = view(request)
+                timings.append(time.perf_counter() - started)
+                if response.status_code != 201:
+                    self.stderr.write(f"Registration failed: {response.data}")
+                    break
+            transaction.set_rollback(True)
+
+        timings.sort()
+        total = sum(timings)
+        self.stdout.write(f"hasher={settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]}")
+        self.stdout.write(
+            f"{len(timings)} registrations in {total:.2f}s "
+            f"({len(timings) / total:.1f}/s per worker), "
+            f"p50={timings[len(timings) // 2] * 1000:.0f}ms "
+            f"p99={timings[int(len(timings) * 0.99) - 1] * 1000:.0f}ms"
+        )
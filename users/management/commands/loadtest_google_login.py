@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from users.google_stub import GoogleStubServer
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests Google sign-in callbacks against a local stub server that adds "
+        "--delay seconds to each response. The same number of sign-ins is served "
+        "one after another, as a sync worker thread would, and all at once through "
+        "the ASGI handler in a single event loop. The GOOGLE_* settings must point "
+        "at --port (see run_google_stub). The users created are deleted afterwards. "
+        "Only runs with DEBUG on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=50)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--delay", type=float, default=0.2)
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError(
+                "The Google stub is for development only; run with DEBUG on."
+            )
+        count = options["logins"]
+        google_config = settings.AUTHLIB_OAUTH_CLIENTS["google"]
+        server = GoogleStubServer(
+            google_config["client_id"],
+            address=("127.0.0.1", options["port"]),
+            delay=options["delay"],
+        )
+        if google_config["access_token_url"] != server.settings()["GOOGLE_TOKEN_URL"]:
+            server.server_close()
+            raise CommandError(
+                "The Google settings do not point at the stub. Export:\n"
+                + "\n".join(f"{k}={v}" for k, v in server.settings().items())
+            )
+        server.start()
+
+        last_pk = User.objects.order_by("-pk").values_list("pk", flat=True).first()
+        try:
+            with override_settings(ALLOWED_HOSTS=["*"]):
+                sync_elapsed = self.run_sync(count)
+                async_elapsed = asyncio.run(self.run_async(count))
+        finally:
+            server.shutdown()
+            User.objects.filter(
+                pk__gt=last_pk or 0,
+                email__startswith="stub-user-",
+                email__endswith="@example.com",
+            ).delete()
+
+        self.stdout.write(f"stub latency: {options['delay'] * 1000:.0f}ms per response")
+        for label, elapsed in (
+            ("sync, one worker thread", sync_elapsed),
+            ("async, one event loop", async_elapsed),
+        ):
+            self.stdout.write(
+                f"{label}: {count} sign-ins in {elapsed:.2f}s ({count / elapsed:.1f}/s)"
+            )
+        self.stdout.write(f"speedup: {sync_elapsed / async_elapsed:.1f}x")
+
+    def run_sync(self, count):
+        pairs = []
+        for _ in range(count):
+            client = Client()
+            authorize_url = client.get(reverse("users:google-signin"))["Location"]
+            callback = requests.get(authorize_url, allow_redirects=False)
+            pairs.append((client, callback.headers["Location"]))
+
+        started = time.perf_counter()
+        for client, callback_url in pairs:
+            self.check_signed_in(client.get(callback_url))
+        return time.perf_counter() - started
+
+    async def run_async(self, count):
+        async def authorize(client):
+            response = await client.get(reverse("users:google-signin"))
+            callback = await asyncio.to_thread(
+                requests.get, response["Location"], allow_redirects=False
+            )
+            return client, callback.headers["Location"]
+
+        pairs = await asyncio.gather(*(authorize(AsyncClient()) for _ in range(count)))
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(client.get(callback_url) for client, callback_url in pairs)
+        )
+        elapsed = time.perf_counter() - started
+        for response in responses:
+            self.check_signed_in(response)
+        return elapsed
+
+    def check_signed_in(self, response):
+        if response.status_code != 302:
+            raise CommandError(f"Sign-in failed: {response.content!r}")
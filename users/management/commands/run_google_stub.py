@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.google_stub import GoogleStubServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a local stub of Google's OAuth endpoints. Export the printed "
+        "variables before starting the app to sign in against it. Only runs with "
+        "DEBUG on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--delay", type=float, default=0, help="Seconds added to every response."
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError(
+                "The Google stub is for development only; run with DEBUG on."
+            )
+        server = GoogleStubServer(
+            settings.AUTHLIB_OAUTH_CLIENTS["google"]["client_id"],
+            address=("127.0.0.1", options["port"]),
+            delay=options["delay"],
+        )
+        for name, value in server.settings().items():
+            self.stdout.write(f"export {name}={value}")
+        self.stdout.write(f"Google stub listening on {server.url}", self.style.SUCCESS)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.revocation import sweep_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes revoked refresh token records whose tokens have expired. "
+        "Schedule it (e.g. daily) to keep the revocation table small."
+    )
+
+    def handle(self, *args, **options):
+        deleted = sweep_expired()
+        self.stdout.write(f"Deleted {deleted} expired revocation records.")
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0017_remove_studentprofile_room_no"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["user_type", "is_verified"],
+                name="users_user_user_ty_fb1442_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["user_type", "is_approved"],
+                name="users_user_user_ty_e2f700_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["user_type", "paid_reg"], name="users_user_user_ty_e85c7b_idx"
+            ),
+        ),
+    ]
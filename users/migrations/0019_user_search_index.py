@@ -0,0 +1,56 @@
+from django.db import migrations
+
+SEARCH_TABLE = "users_user_search"
+
+TRIGRAM_INDEXES = (
+    ("users_user", "first_name"),
+    ("users_user", "last_name"),
+    ("users_user", "email"),
+    ("users_studentprofile", "matric_no"),
+    ("users_studentprofile", "student_id"),
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "first_name, last_name, email, matric_no, student_id, "
+            "tokenize='unicode61', prefix='2 3')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SEARCH_TABLE} "
+            "(rowid, first_name, last_name, email, matric_no, student_id) "
+            "SELECT u.id, u.first_name, u.last_name, u.email, p.matric_no, "
+            "p.student_id FROM users_user u "
+            "LEFT JOIN users_studentprofile p ON p.user_id = u.id"
+        )
+    elif vendor == "postgresql":
+        # icontains compiles to UPPER(col) LIKE UPPER(%s), which these can serve
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, column in TRIGRAM_INDEXES:
+            schema_editor.execute(
+                f"CREATE INDEX {table}_{column}_trgm ON {table} "
+                f"USING gin (UPPER({column}) gin_trgm_ops)"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    elif vendor == "postgresql":
+        for table, column in TRIGRAM_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0018_user_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,90 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+
+CHUNK_SIZE = 500
+
+
+def normalize_emails(apps, schema_editor):
+    """
+    Lowercases every email so the case-insensitive unique constraint can be added.
+
+    When several accounts share an email in different letter cases, the oldest
+    account keeps it. The others are deactivated and their email is prefixed
+    with "duplicate-<id>+", so none of their data is lost and they can be merged
+    by hand; the prefix keeps them unique, so the rest of the address is cut
+    short when it would not fit the column. Users are rewritten in primary key
+    chunks to keep memory flat.
+    """
+    User = apps.get_model("users", "User")
+    max_length = User._meta.get_field("email").max_length
+    duplicates = (
+        User.objects.annotate(email_lower=Lower("email"))
+        .values("email_lower")
+        .annotate(count=Count("id"), keep=Min("id"))
+        .filter(count__gt=1)
+    )
+    duplicate_emails = {row["email_lower"] for row in duplicates}
+    keep_ids = {row["keep"] for row in duplicates}
+
+    # Move the extra accounts out of the way first, so lowercasing the kept
+    # ones can't collide with them
+    extras = list(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=duplicate_emails)
+        .exclude(pk__in=keep_ids)
+        .only("pk", "email", "is_active")
+    )
+    for user in extras:
+        user.email = f"duplicate-{user.pk}+{user.email.lower()}"[:max_length]
+        user.is_active = False
+    User.objects.bulk_update(extras, ["email", "is_active"], batch_size=CHUNK_SIZE)
+
+    changed_any = bool(extras)
+    last_pk = 0
+    while True:
+        chunk = list(
+            User.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", "email")[:CHUNK_SIZE]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+
+        changed = [user for user in chunk if user.email != user.email.lower()]
+        for user in changed:
+            user.email = user.email.lower()
+        User.objects.bulk_update(changed, ["email"])
+        changed_any = changed_any or bool(changed)
+
+    if changed_any and schema_editor.connection.vendor == "sqlite":
+        # Refresh the search index created in 0019
+        schema_editor.execute("DELETE FROM users_user_search")
+        schema_editor.execute(
+            "INSERT INTO users_user_search "
+            "(rowid, first_name, last_name, email, matric_no, student_id) "
+            "SELECT u.id, u.first_name, u.last_name, u.email, p.matric_no, "
+            "p.student_id FROM users_user u "
+            "LEFT JOIN users_studentprofile p ON p.user_id = u.id"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0019_user_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="users_user_email_lower_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.4 on 2026-10-18 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_academicsession"),
+        ("users", "0021_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="studentprofile",
+            index=models.Index(
+                fields=["faculty", "department"], name="users_stude_faculty_3b39d6_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentprofile",
+            index=models.Index(fields=["level"], name="users_stude_level_d7e41b_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="studentprofile",
+            index=models.Index(
+                fields=["hall_of_residence"], name="users_stude_hall_of_350c2c_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0022_studentprofile_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="revokedtoken",
+            name="revoked_at",
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -1,8 +1,5 @@
-import datetime
-
-import jwt
-
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import (
     BaseUserManager,
     AbstractBaseUser,
@@ -12,12 +9,32 @@ from django.db import transaction
 from django.conf import settings
 from django.http import HttpRequest
 
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .enums import UserTypes, AuthProviders, LevelChoices
+from .tokens import UserRefreshToken, make_action_token
 
 
 class CustomUserManager(BaseUserManager):
+    @classmethod
+    def normalize_email(cls, email):
+        """Lowercases the whole address, since emails are matched case-insensitively."""
+        return (email or "").strip().lower()
+
+    def get_by_natural_key(self, username):
+        return self.get(email__lower=self.normalize_email(username))
+
+    def get_by_email(self, email):
+        """Returns the user with this email in any letter case, or None."""
+        if not email:
+            return None
+        return self.filter(email__lower=self.normalize_email(email)).first()
+
+    async def aget_by_email(self, email):
+        """Async version of get_by_email."""
+        if not email:
+            return None
+        return await self.filter(email__lower=self.normalize_email(email)).afirst()
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError("The Email field must be set")
@@ -69,6 +86,17 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = "email"
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(Lower("email"), name="users_user_email_lower_uniq"),
+        ]
+        # Match the filters of the admin user listing, which pages by id
+        indexes = [
+            models.Index(fields=["user_type", "is_verified"]),
+            models.Index(fields=["user_type", "is_approved"]),
+            models.Index(fields=["user_type", "paid_reg"]),
+        ]
+
     def __str__(self):
         return (
             f"{self.first_name} {self.last_name}"
@@ -76,32 +104,21 @@ class User(AbstractBaseUser, PermissionsMixin):
             else self.email
         )
 
-    def generate_jwt_token(
-        self,
-    ):  # I may decide to accept the expiry time as a parameter
+    def save(self, *args, **kwargs):
+        self.email = self.__class__.objects.normalize_email(self.email)
+        super().save(*args, **kwargs)
+
+    def generate_action_token(self, purpose):
         """
-        Generates a JSON Web Token that stores user's information
+        Generates a single-use token for an email verification or password reset link
         """
-        token = jwt.encode(
-            {
-                "id": self.pk,
-                "email": self.email,
-                "first_name": self.first_name,
-                "last_name": self.last_name,
-                "user_type": self.user_type,
-                "exp": datetime.datetime.utcnow()
-                + datetime.timedelta(hours=24),  # Should I remove the expiry time?
-            },
-            settings.SECRET_KEY,
-            algorithm="HS256",
-        )
-        return token
+        return make_action_token(self, purpose)
 
     def get_tokens_for_user(self):
         """
         Generates refresh and access tokens for user
         """
-        refresh = RefreshToken.for_user(self)
+        refresh = UserRefreshToken.for_user(self)
         return {
             "refresh": str(refresh),
             "access": str(refresh.access_token),
@@ -118,9 +135,14 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def primary_provider(self) -> str:
         """Returns the first provider user signed up with."""
-        return self.auth_provider
+        return self.primary_auth_provider
 
 
+# Lets User email lookups be written as email__lower=..., which the
+# Lower("email") unique index can serve. Registered on this field only, so
+# other EmailFields are left alone.
+User._meta.get_field("email").register_lookup(Lower)
+
 
 class UserProfile(models.Model):
     """
@@ -149,6 +171,30 @@ class StudentProfile(UserProfile):
         related_name="students",
     )
 
+    class Meta:
+        # Match the filters of the student profile listing, which pages by user id
+        indexes = [
+            models.Index(fields=["faculty", "department"]),
+            models.Index(fields=["level"]),
+            models.Index(fields=["hall_of_residence"]),
+        ]
+
 
 class TutorProfile(UserProfile):
     pass
+
+
+class RevokedToken(models.Model):
+    """
+    A revoked refresh token, or a cutoff revoking all of one user's refresh tokens.
+
+    Rows are keyed by a short hash of the token's jti (or of the user), and are
+    only kept until every token they revoke has expired; see users.revocation.
+    """
+
+    key = models.CharField(max_length=32, unique=True)
+    revoked_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.key
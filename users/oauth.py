@@ -0,0 +1,216 @@
+"""
+Authlib client classes for signing in with Google.
+
+Tokens are exchanged over a process-wide pool of HTTP connections, and the
+provider's JSON Web Key Set is cached in memory so ID tokens are verified
+locally instead of asking the provider about every login. The async methods
+make the same calls with httpx, so an ASGI worker can wait on many providers
+at once.
+"""
+
+import asyncio
+import contextlib
+import logging
+import re
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from authlib.integrations.base_client import MismatchingStateError, OAuthError
+from authlib.integrations.django_client import DjangoOAuth2App, OAuth
+from authlib.oidc.core import UserInfo
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    An adapter whose connections outlive the sessions it is mounted on.
+
+    Authlib opens a new session for every request and closes it afterwards,
+    which would also close a regular adapter's connection pool.
+    """
+
+    def close(self):
+        pass
+
+
+http_adapter = PooledHTTPAdapter(
+    pool_connections=4, pool_maxsize=settings.OAUTH_HTTP_POOL_SIZE
+)
+
+
+def mount_pooled_adapter(session):
+    session.mount("https://", http_adapter)
+    session.mount("http://", http_adapter)
+    return session
+
+
+http_session = mount_pooled_adapter(requests.Session())
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _new_async_http_client():
+    return httpx.AsyncClient(
+        timeout=settings.OAUTH_HTTP_TIMEOUT,
+        limits=httpx.Limits(max_connections=settings.OAUTH_HTTP_POOL_SIZE),
+    )
+
+
+@contextlib.asynccontextmanager
+async def async_http_client(request):
+    """
+    Yields an httpx client for the outbound calls made while serving `request`.
+
+    Connections belong to the event loop that opened them. Under ASGI the loop
+    outlives the request, so its pooled client is shared by every request of
+    the worker. Under WSGI each async view runs in a loop of its own, so the
+    client is opened for the request and closed after it.
+    """
+    if isinstance(request, ASGIRequest):
+        loop = asyncio.get_running_loop()
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = _new_async_http_client()
+        yield client
+    else:
+        async with _new_async_http_client() as client:
+            yield client
+
+
+class JWKSCache:
+    """
+    An in-memory copy of a JSON Web Key Set.
+
+    Keys are kept for the max-age sent by the provider (or `ttl` seconds).
+    Once stale they are still served while a background thread refreshes
+    them, so only the very first login waits on the JWKS endpoint. A forced
+    refresh, for a token signed with an unknown key, happens at most once
+    every `min_refresh_interval` seconds.
+    """
+
+    def __init__(self, uri, ttl, min_refresh_interval=60):
+        self.uri = uri
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys = None
+        self._fetched_at = 0
+        self._expires_at = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self, force=False):
+        if self._keys is None or (force and self._can_force_refresh()):
+            with self._lock:
+                # another thread may have fetched while this one waited
+                if self._keys is None or (force and self._can_force_refresh()):
+                    self._fetch()
+        elif time.monotonic() >= self._expires_at:
+            self._refresh_in_background()
+        return self._keys
+
+    def _can_force_refresh(self):
+        return time.monotonic() - self._fetched_at >= self.min_refresh_interval
+
+    def _fetch(self):
+        response = http_session.get(self.uri, timeout=settings.OAUTH_HTTP_TIMEOUT)
+        response.raise_for_status()
+        self._keys = response.json()
+        self._fetched_at = time.monotonic()
+        max_age = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        self._expires_at = self._fetched_at + (
+            int(max_age.group(1)) if max_age else self.ttl
+        )
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            with self._lock:
+                self._fetch()
+        except Exception:
+            logger.exception("Failed to refresh the JWKS from %s", self.uri)
+            # keep serving the current keys and try again a little later
+            self._expires_at = time.monotonic() + self.min_refresh_interval
+        finally:
+            self._refreshing = False
+
+
+class PooledOAuth2App(DjangoOAuth2App):
+    """An OAuth2 client with pooled connections and a cached JWKS."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jwks_cache = JWKSCache(
+            self.server_metadata["jwks_uri"], ttl=settings.OAUTH_JWKS_TTL
+        )
+
+    def _get_oauth_client(self, **metadata):
+        return mount_pooled_adapter(super()._get_oauth_client(**metadata))
+
+    def fetch_jwk_set(self, force=False):
+        return self.jwks_cache.get(force=force)
+
+    async def aauthorize_access_token(self, request, client, claims_options=None):
+        """
+        Async version of authorize_access_token, making its call with `client`
+        (see async_http_client).
+
+        Exchanges the callback's code for tokens and verifies the ID token,
+        whose claims are returned under "userinfo".
+        """
+        error = request.GET.get("error")
+        if error:
+            raise OAuthError(
+                error=error, description=request.GET.get("error_description")
+            )
+        state = request.GET.get("state")
+        session = request.session
+        state_data = await sync_to_async(self.framework.get_state_data)(session, state)
+        await sync_to_async(self.framework.clear_state_data)(session, state)
+        if state_data is None:
+            raise MismatchingStateError()
+
+        response = await client.post(
+            self.access_token_url,
+            data={
+                "grant_type": "authorization_code",
+                "code": request.GET.get("code"),
+                "redirect_uri": state_data["redirect_uri"],
+            },
+            auth=(self.client_id, self.client_secret),
+            headers={"Accept": "application/json"},
+        )
+        response.raise_for_status()
+        token = response.json()
+        if "id_token" in token and "nonce" in state_data:
+            # Runs off the event loop, as it may have to fetch the JWKS.
+            token["userinfo"] = await sync_to_async(
+                self.parse_id_token, thread_sensitive=False
+            )(token, nonce=state_data["nonce"], claims_options=claims_options)
+        return token
+
+    async def auserinfo(self, token, client):
+        """Async version of userinfo, making its call with `client`."""
+        response = await client.get(
+            self.server_metadata["userinfo_endpoint"],
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+        )
+        response.raise_for_status()
+        return UserInfo(response.json())
+
+
+class PooledOAuth(OAuth):
+    oauth2_client_cls = PooledOAuth2App
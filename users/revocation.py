@@ -0,0 +1,125 @@
+"""
+Revocation store for refresh tokens.
+
+Revoked tokens are recorded as hashed keys in the RevokedToken table and
+mirrored into the revocation cache (CACHES["revocation"]), which answers every
+lookup: the refresh endpoint reads the token's key, its user's revoked-before
+cutoff and a "synced" marker in one get_many, without touching the database.
+While the marker is present, a key missing from the cache means "not revoked",
+so that cache must never evict entries on its own (the default LocMem alias
+is sized not to cull).
+
+The marker expires every REVOCATION_CACHE_SYNC_SECONDS. The next lookup then
+loads the rows revoked since the previous sync, or every unexpired row when
+the cache is cold, so with a per-process cache, revocations made by other
+processes are seen within that time.
+
+Run the sweep_revoked_tokens command periodically to delete expired rows.
+"""
+
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import RevokedToken
+
+SYNCED_KEY = "revoked-token:synced"
+# The time of the last sync; rows revoked since then are loaded on the next one
+WATERMARK_KEY = "revoked-token:watermark"
+
+
+def _cache():
+    return caches[settings.REVOCATION_CACHE_ALIAS]
+
+
+def _hash(value):
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+def token_key(jti):
+    return _hash(f"jti:{jti}")
+
+
+def user_key(user_id):
+    return _hash(f"user:{user_id}")
+
+
+def _cache_key(key):
+    return f"revoked-token:{key}"
+
+
+def _store(rows):
+    """Saves {key: (revoked_at, expires_at)} to the table and the cache."""
+    RevokedToken.objects.bulk_create(
+        [
+            RevokedToken(key=key, revoked_at=revoked_at, expires_at=expires_at)
+            for key, (revoked_at, expires_at) in rows.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["revoked_at", "expires_at"],
+    )
+    _cache_rows((key, revoked_at) for key, (revoked_at, _) in rows.items())
+
+
+def _cache_rows(rows):
+    """Caches (key, revoked_at) rows until every token they revoke has expired."""
+    _cache().set_many(
+        {_cache_key(key): int(revoked_at.timestamp()) for key, revoked_at in rows},
+        timeout=settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds(),
+    )
+
+
+def revoke_token(jti, expires_at):
+    """Revokes one refresh token until it expires (an epoch timestamp)."""
+    expires_at = datetime.datetime.fromtimestamp(expires_at, tz=datetime.timezone.utc)
+    _store({token_key(jti): (timezone.now(), expires_at)})
+
+
+def revoke_user_tokens(user_ids):
+    """Revokes every refresh token issued to these users up to now."""
+    now = timezone.now()
+    expires_at = now + settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"]
+    _store({user_key(user_id): (now, expires_at) for user_id in user_ids})
+
+
+def _sync_cache():
+    cache = _cache()
+    now = timezone.now()
+    rows = RevokedToken.objects.filter(expires_at__gt=now)
+    watermark = cache.get(WATERMARK_KEY)
+    if watermark is not None:
+        # Overlap by one sync period, for rows committed a little after their
+        # revoked_at was set
+        overlap = datetime.timedelta(seconds=settings.REVOCATION_CACHE_SYNC_SECONDS)
+        rows = rows.filter(revoked_at__gte=watermark - overlap)
+    _cache_rows(rows.values_list("key", "revoked_at"))
+    cache.set(WATERMARK_KEY, now, timeout=None)
+    cache.set(SYNCED_KEY, True, timeout=settings.REVOCATION_CACHE_SYNC_SECONDS)
+
+
+def is_token_revoked(jti, user_id, issued_at):
+    """
+    Returns whether a refresh token was revoked, by itself or with its user's.
+
+    A user's cutoff also covers tokens issued in the same second as it.
+    """
+    cache = _cache()
+    keys = [_cache_key(token_key(jti)), _cache_key(user_key(user_id))]
+    found = cache.get_many([*keys, SYNCED_KEY])
+    if SYNCED_KEY not in found:
+        _sync_cache()
+        found = cache.get_many(keys)
+    if keys[0] in found:
+        return True
+    user_cutoff = found.get(keys[1])
+    return user_cutoff is not None and issued_at <= user_cutoff
+
+
+def sweep_expired():
+    """Deletes the rows of tokens that have expired anyway; returns how many."""
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -0,0 +1,108 @@
+"""
+Indexed search over users' names, emails and student matric numbers/IDs.
+
+On SQLite the searchable columns are mirrored into an FTS5 virtual table that
+is kept in sync from the User and StudentProfile signals. Other backends
+search the tables directly and rely on the trigram indexes created in
+migration 0019.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+SEARCH_TABLE = "users_user_search"
+SEARCH_FIELDS = (
+    "first_name",
+    "last_name",
+    "email",
+    "studentprofile__matric_no",
+    "studentprofile__student_id",
+)
+
+_INDEX_SQL = f"""
+    INSERT INTO {SEARCH_TABLE}
+        (rowid, first_name, last_name, email, matric_no, student_id)
+    SELECT u.id, u.first_name, u.last_name, u.email, p.matric_no, p.student_id
+    FROM users_user u
+    LEFT JOIN users_studentprofile p ON p.user_id = u.id
+"""
+
+
+def uses_fts():
+    return connection.vendor == "sqlite"
+
+
+def index_users(user_ids=None):
+    """
+    (Re)indexes the given users, or every user when `user_ids` is None.
+
+    Takes two statements regardless of how many users are indexed, so bulk
+    imports should call it once with all the new IDs.
+    """
+    if not uses_fts():
+        return
+    with connection.cursor() as cursor:
+        if user_ids is None:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+            cursor.execute(_INDEX_SQL)
+            return
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", user_ids
+        )
+        cursor.execute(f"{_INDEX_SQL} WHERE u.id IN ({placeholders})", user_ids)
+
+
+def unindex_user(user_id):
+    if not uses_fts():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [user_id])
+
+
+def _terms(query):
+    return re.findall(r"\w+", query.lower())
+
+
+def search_user_ids(query, limit=20):
+    """Returns the IDs of the users best matching `query`, best match first."""
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    if uses_fts():
+        # Every term must match as a prefix of some column; bm25 ranks the rest
+        match = " ".join(f'"{term}"*' for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+                "ORDER BY rank LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    from .models import User
+
+    queryset = User.objects.all()
+    prefix_match = Q()
+    for term in terms:
+        term_match = Q()
+        for field in SEARCH_FIELDS:
+            term_match |= Q(**{f"{field}__icontains": term})
+            prefix_match |= Q(**{f"{field}__istartswith": term})
+        queryset = queryset.filter(term_match)
+    queryset = queryset.annotate(
+        search_rank=Case(
+            When(prefix_match, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    )
+    return list(
+        queryset.order_by("search_rank", "pk").values_list("pk", flat=True)[:limit]
+    )
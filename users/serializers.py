@@ -1,6 +1,8 @@
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.core.validators import EmailValidator, RegexValidator
+from django.db.models import F
 from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
 
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
@@ -10,11 +12,20 @@ from rest_framework.exceptions import (
     AuthenticationFailed,
 )
 
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+
+from core.serializers import ClassSummarySerializer
+from courses.models import Course
+from results.models import Result
 
 from .models import User, StudentProfile, TutorProfile
 from .utils import send_tutor_account_created_email, send_student_profile_creation_email
-from .enums import UserTypes, AuthProviders
+from .enums import UserTypes, AuthProviders, LevelChoices
+from .tokens import UserRefreshToken
 
 
 class UserSerializer(
@@ -34,12 +45,41 @@ class UserSerializer(
         )
 
 
+class UserSearchResultSerializer(serializers.ModelSerializer):
+    matric_no = serializers.CharField(
+        source="studentprofile.matric_no", read_only=True, allow_null=True
+    )
+    student_id = serializers.CharField(
+        source="studentprofile.student_id", read_only=True, allow_null=True
+    )
+
+    class Meta:
+        model = User
+        fields = (
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "user_type",
+            "matric_no",
+            "student_id",
+        )
+
+
+class LowercaseEmailField(serializers.EmailField):
+    """An email field that normalizes to lowercase before validators run."""
+
+    def to_internal_value(self, data):
+        return User.objects.normalize_email(super().to_internal_value(data))
+
+
 class StudentUserSerializer(serializers.ModelSerializer):
-    email = serializers.EmailField(
+    email = LowercaseEmailField(
         validators=[
             UniqueValidator(
                 queryset=User.objects.all(),
                 message="A user with this email already exists.",
+                lookup="lower",
             ),
             EmailValidator(message="Invalid email address."),
         ],
@@ -95,10 +135,15 @@ class StudentUserSerializer(serializers.ModelSerializer):
         read_only_fields = ("is_active", "paid_reg", "is_staff", "user_type", "is_verified")
 
     def create(self, validated_data):
-        user = User.objects.create_user(**validated_data)
-        user.user_type = UserTypes.STUDENT
-        user.save()
-        return user
+        # Callers may hash the password up front so the work stays out of their
+        # write transaction; see StudentRegisterView.post.
+        password = validated_data.pop("password")
+        password_hash = validated_data.pop("password_hash", None)
+        validated_data["email"] = User.objects.normalize_email(validated_data["email"])
+        validated_data["user_type"] = UserTypes.STUDENT
+        return User.objects.create(
+            password=password_hash or make_password(password), **validated_data
+        )
 
     def validate(self, data):
         # to make sure that the 'is_approved' field is only set to True by a staff
@@ -110,6 +155,15 @@ class StudentUserSerializer(serializers.ModelSerializer):
 
 
 class TutorUserSerializer(serializers.ModelSerializer):
+    email = LowercaseEmailField(
+        validators=[
+            UniqueValidator(
+                queryset=User.objects.all(),
+                message="A user with this email already exists.",
+                lookup="lower",
+            ),
+        ],
+    )
     first_name = serializers.CharField(
         validators=[
             RegexValidator(
@@ -168,6 +222,95 @@ class TutorUserSerializer(serializers.ModelSerializer):
         return user
 
 
+class StudentImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+
+
+class StudentImportRowSerializer(serializers.Serializer):
+    """Validates one row of a student CSV import; uniqueness is checked in bulk."""
+
+    email = serializers.EmailField()
+    first_name = serializers.CharField(
+        validators=[
+            RegexValidator(
+                r"^[a-zA-Z-' ]+$",
+                "Name must include letters, hyphens, or apostrophes only",
+            ),
+        ],
+        required=False,
+    )
+    last_name = serializers.CharField(
+        validators=[
+            RegexValidator(
+                r"^[a-zA-Z-' ]+$",
+                "Name must include letters, hyphens, or apostrophes only",
+            ),
+        ],
+        required=False,
+    )
+    phone_number = serializers.CharField(required=False, allow_blank=True)
+    matric_no = serializers.CharField(max_length=20)
+    faculty = serializers.CharField(max_length=250, required=False, allow_blank=True)
+    department = serializers.CharField(
+        max_length=250, required=False, allow_blank=True
+    )
+    level = serializers.ChoiceField(choices=LevelChoices, required=False)
+    hall_of_residence = serializers.CharField(
+        max_length=100, required=False, allow_blank=True
+    )
+
+
+class BulkUserActionSerializer(serializers.Serializer):
+    """Selects users for a bulk action by explicit IDs and/or student filters."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+    )
+    user_type = serializers.ChoiceField(choices=UserTypes, required=False)
+    student_class = serializers.IntegerField(required=False)
+    level = serializers.ChoiceField(choices=LevelChoices, required=False)
+
+    def validate_ids(self, value):
+        limit = settings.BULK_USER_ACTION_BATCH_SIZE
+        if len(value) > limit:
+            raise ValidationError(f"Provide at most {limit} ids per request.")
+        return value
+
+    def validate(self, data):
+        if not data:
+            raise ValidationError(
+                "Provide a list of ids or at least one of user_type, student_class or level."
+            )
+        return data
+
+    def get_queryset(self):
+        data = self.validated_data
+        queryset = User.objects.all()
+        if "ids" in data:
+            queryset = queryset.filter(pk__in=data["ids"])
+        if "user_type" in data:
+            queryset = queryset.filter(user_type=data["user_type"])
+        if "student_class" in data:
+            queryset = queryset.filter(
+                studentprofile__student_class=data["student_class"]
+            )
+        if "level" in data:
+            queryset = queryset.filter(studentprofile__level=data["level"])
+        return queryset
+
+
+class StudentProfileFilterSerializer(serializers.Serializer):
+    """Validates the query params that filter the student profile listing."""
+
+    faculty = serializers.CharField(required=False)
+    department = serializers.CharField(required=False)
+    level = serializers.ChoiceField(choices=LevelChoices, required=False)
+    hall = serializers.CharField(required=False)
+    student_class = serializers.IntegerField(required=False, min_value=1)
+
+
 class ResendVerificationEmailSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
@@ -250,18 +393,16 @@ class StudentProfileSerializer(serializers.ModelSerializer):
             # TODO: Make sure only an admin can assign a student to a class.
         }
 
-        def validate_matric_no(self, value):
-            if len(value) != 6:
-                raise ValidationError("Matriculation number must be 6 characters long.")
-            return value
+    def validate_matric_no(self, value):
+        if len(value) != 6:
+            raise ValidationError("Matriculation number must be 6 characters long.")
+        return value
 
-        def create(self, validated_date):
-            student = StudentProfile.objects.create(**validated_date)
-            # Set the user field to the logged in user
-            student.student_id = f"COL/STU/{student.matric_no}"
-            student.save(update_fields=["student_id"])
-            send_student_profile_creation_email(student)
-            return student
+    def create(self, validated_data):
+        validated_data["student_id"] = f"COL/STU/{validated_data['matric_no']}"
+        student = StudentProfile.objects.create(**validated_data)
+        send_student_profile_creation_email(student)
+        return student
 
     # def to_representation(self, instance):
     #     data = super().to_representation(instance)
@@ -269,7 +410,127 @@ class StudentProfileSerializer(serializers.ModelSerializer):
     #     return data
 
 
+class StudentProfileListSerializer(serializers.ModelSerializer):
+    """
+    A student profile row with the student's name and email.
+
+    Expects the profiles to be loaded with select_related("user", "student_class").
+    """
+
+    first_name = serializers.CharField(source="user.first_name", read_only=True)
+    last_name = serializers.CharField(source="user.last_name", read_only=True)
+    email = serializers.EmailField(source="user.email", read_only=True)
+    class_name = serializers.CharField(
+        source="student_class.name", read_only=True, allow_null=True
+    )
+
+    class Meta:
+        model = StudentProfile
+        fields = (
+            "user",
+            "first_name",
+            "last_name",
+            "email",
+            "faculty",
+            "department",
+            "level",
+            "hall_of_residence",
+            "matric_no",
+            "student_id",
+            "student_class",
+            "class_name",
+        )
+        read_only_fields = fields
+
+
+class StudentAccountSerializer(serializers.ModelSerializer):
+    """
+    A student's user, profile and class in one payload.
+
+    Expects the user to be loaded with
+    select_related("studentprofile__student_class__class_tutor"). Extra sections
+    listed in the "include" context ("courses", "results") cost one query each.
+    """
+
+    profile = serializers.SerializerMethodField()
+    student_class = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = (
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "phone_number",
+            "user_type",
+            "paid_reg",
+            "is_active",
+            "is_verified",
+            "is_approved",
+            "profile",
+            "student_class",
+        )
+
+    def _get_profile(self, instance):
+        try:
+            return instance.studentprofile
+        except StudentProfile.DoesNotExist:
+            return None
+
+    def get_profile(self, instance):
+        profile = self._get_profile(instance)
+        if profile is None:
+            return None
+        return {
+            "student_id": profile.student_id,
+            "matric_no": profile.matric_no,
+            "faculty": profile.faculty,
+            "department": profile.department,
+            "level": profile.level,
+            "hall_of_residence": profile.hall_of_residence,
+        }
+
+    def get_student_class(self, instance):
+        profile = self._get_profile(instance)
+        if profile is None or profile.student_class is None:
+            return None
+        return ClassSummarySerializer(profile.student_class).data
+
+    def to_representation(self, instance):
+        rep = super().to_representation(instance)
+        include = self.context.get("include", ())
+        profile = self._get_profile(instance)
+        class_id = profile.student_class_id if profile else None
+        if "courses" in include:
+            rep["courses"] = (
+                list(
+                    Course.objects.filter(
+                        class_name_id=class_id, academic_session__is_active=True
+                    ).values("id", "course_code", "course_title", "tutor_id")
+                )
+                if class_id
+                else []
+            )
+        if "results" in include:
+            rep["results"] = list(
+                Result.objects.filter(
+                    student=instance, academic_session__is_active=True
+                ).values(
+                    "course_id",
+                    "semester",
+                    "score",
+                    "remark",
+                    course_code=F("course__course_code"),
+                    course_title=F("course__course_title"),
+                )
+            )
+        return rep
+
+
 class TutorTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserRefreshToken
+
     def validate(self, attrs):
         data = super().validate(attrs)
 
@@ -288,6 +549,8 @@ class TutorTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 
 class StudentTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserRefreshToken
+
     def validate(self, attrs):
         data = super().validate(attrs)
 
@@ -336,3 +599,11 @@ class StudentTokenObtainPairSerializer(TokenObtainPairSerializer):
             "message": "Token obtained successfully.",
             "tokens": data,
         }
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserRefreshToken
+
+
+class LogoutSerializer(TokenBlacklistSerializer):
+    token_class = UserRefreshToken
@@ -1,8 +1,11 @@
 from django.dispatch import receiver
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 
 from .models import User, StudentProfile, TutorProfile
 from .enums import UserTypes, AuthProviders
+from .authentication import invalidate_cached_user
+from .search import index_users, unindex_user
+from .revocation import revoke_user_tokens
 
 
 # @receiver(post_save, sender=User)
@@ -18,3 +21,39 @@ from .enums import UserTypes, AuthProviders
 # def generate_student_id(sender, instance, **kwargs):
 #     if not instance.student_id:
 #         instance.student_id = f"COL/STU/{instance.matric_no}"
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_deactivated_user_tokens(sender, instance, update_fields=None, **kwargs):
+    if instance.is_active or (update_fields and "is_active" not in update_fields):
+        return
+    revoke_user_tokens([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    revoke_user_tokens([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def index_saved_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not set(update_fields) & {"first_name", "last_name", "email"}:
+        return
+    index_users([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_user(sender, instance, **kwargs):
+    unindex_user(instance.pk)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def index_student_profile(sender, instance, **kwargs):
+    index_users([instance.user_id])
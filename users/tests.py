@@ -1,3 +1,165 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .authentication import get_user_cache_key
+from .enums import UserTypes
+from .models import User
+from .serializers import StudentProfileSerializer
+from .revocation import is_token_revoked, revoke_token
+from .tokens import ActionTokenPurposes, UserRefreshToken, consume_action_token
+
+
+class RefreshTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="student@example.com")
+
+    def setUp(self):
+        for alias in ("default", "revocation"):
+            caches[alias].clear()
+
+    def refresh(self, token):
+        return APIClient().post(
+            reverse("users:refresh-token"), {"refresh": token}, format="json"
+        )
+
+    def test_refresh_reads_nothing_from_the_db_once_warm(self):
+        response = self.refresh(str(UserRefreshToken.for_user(self.user)))
+        self.assertEqual(response.status_code, 200)
+        # Only the write revoking the rotated token
+        with self.assertNumQueries(1):
+            response = self.refresh(response.data["tokens"]["refresh"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_rotated_token_cannot_be_reused(self):
+        token = str(UserRefreshToken.for_user(self.user))
+        self.assertEqual(self.refresh(token).status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_revocation_outlives_many_later_revocations(self):
+        expires_at = int(time.time()) + 3600
+        revoke_token("revoked", expires_at)
+        for i in range(1000):
+            revoke_token(f"other-{i}", expires_at)
+        self.assertTrue(is_token_revoked("revoked", self.user.pk, 0))
+        self.assertFalse(is_token_revoked("valid", self.user.pk, 0))
+
+
+class StudentProfileFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create(email="staff@example.com", is_staff=True)
+
+    def list_profiles(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        return client.get(reverse("users:student-profile"), params)
+
+    def test_invalid_filters_are_rejected(self):
+        for params in ({"student_class": "abc"}, {"level": "999"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.list_profiles(**params).status_code, 400)
+
+    def test_valid_filters_are_applied(self):
+        response = self.list_profiles(student_class="1", level="100", faculty="")
+        self.assertEqual(response.status_code, 200)
+
+
+class BulkUserUpdateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(
+            email="admin@example.com", user_type=UserTypes.ADMIN, is_admin=True
+        )
+        User.objects.bulk_create(
+            User(email=f"student-{i}@example.com", is_active=True) for i in range(5)
+        )
+
+    def deactivate(self, data):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        return client.post(reverse("users:users-bulk-deactivate"), data, format="json")
+
+    @override_settings(BULK_USER_ACTION_BATCH_SIZE=2)
+    def test_ids_are_capped(self):
+        ids = list(User.objects.exclude(pk=self.admin.pk).values_list("pk", flat=True))
+        self.assertEqual(self.deactivate({"ids": ids}).status_code, 400)
+
+    @override_settings(BULK_USER_ACTION_BATCH_SIZE=2)
+    def test_filtered_users_are_updated_in_batches(self):
+        students = User.objects.filter(user_type=UserTypes.STUDENT)
+        keys = {pk: get_user_cache_key(pk) for pk in students.values_list("pk", flat=True)}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.deactivate({"user_type": UserTypes.STUDENT})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["updated"], len(keys))
+        self.assertFalse(students.filter(is_active=True).exists())
+        for pk, key in keys.items():
+            self.assertNotEqual(get_user_cache_key(pk), key)
+
+
+class StudentRegistrationTests(TestCase):
+    def register(self, email):
+        return APIClient().post(
+            reverse("users:register-student"),
+            {"email": email, "password": "Str0ng-pass"},
+            format="json",
+        )
+
+    def test_duplicate_email_gets_the_explicit_response(self):
+        User.objects.create(email="taken@example.com")
+        response = self.register("Taken@Example.com")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data,
+            {"success": False, "message": "A user with this email already exists."},
+        )
+
+
+class ActionTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email="student@example.com")
+
+    def setUp(self):
+        caches["default"].clear()
+        self.token = self.user.generate_action_token(ActionTokenPurposes.RESET)
+
+    def reset_password(self, token):
+        password = "N3w-password"
+        return APIClient().patch(
+            reverse("users:reset-password"),
+            {"token": token, "password": password, "confirm_password": password},
+            format="json",
+        )
+
+    def test_reset_token_cannot_be_reused(self):
+        self.assertEqual(self.reset_password(self.token).status_code, 200)
+        self.assertEqual(self.reset_password(self.token).status_code, 400)
+
+    def test_used_token_is_rejected_without_the_denylist(self):
+        self.assertEqual(self.reset_password(self.token).status_code, 200)
+        caches["default"].clear()
+        self.assertEqual(self.reset_password(self.token).status_code, 400)
+
+    def test_failed_use_leaves_the_token_usable(self):
+        def fail(user):
+            raise RuntimeError("write failed")
+
+        with self.assertRaises(RuntimeError):
+            consume_action_token(self.token, ActionTokenPurposes.RESET, fail)
+        self.assertEqual(self.reset_password(self.token).status_code, 200)
+
+
+class StudentProfileSerializerTests(TestCase):
+    def test_matric_no_must_be_six_characters(self):
+        user = User.objects.create(email="student@example.com")
+        serializer = StudentProfileSerializer(
+            data={"user": user.pk, "matric_no": "12345"}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("matric_no", serializer.errors)
@@ -0,0 +1,164 @@
+import secrets
+import time
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token that also carries the user's role claims.
+
+    The claims are copied into every access token minted from it, which lets
+    read-only endpoints authenticate statelessly (see
+    users.authentication.StatelessJWTAuthentication) without loading the user.
+    They are rebuilt from the (cached) user row whenever the token is
+    verified, i.e. on every refresh, so rotated tokens and new access tokens
+    drop roles the user has lost, and inactive users cannot refresh.
+
+    Tokens can be revoked (see users.revocation); simplejwt revokes the old
+    token through `blacklist` whenever it rotates one.
+    """
+
+    def verify(self):
+        from .revocation import is_token_revoked
+
+        super().verify()
+        if is_token_revoked(
+            self[api_settings.JTI_CLAIM],
+            self.payload.get(api_settings.USER_ID_CLAIM),
+            self["iat"],
+        ):
+            raise TokenError(_("Token is blacklisted"))
+        self.refresh_role_claims()
+
+    def refresh_role_claims(self):
+        # The same cached row CachedJWTAuthentication serves, so refreshing
+        # usually costs no query
+        from .authentication import get_cached_user
+
+        user = get_cached_user(self.payload.get(api_settings.USER_ID_CLAIM))
+        if user is None or not user.is_active:
+            raise TokenError(_("User not found or inactive"))
+        self.set_role_claims(user)
+
+    def set_role_claims(self, user):
+        self["user_type"] = user.user_type
+        self["is_staff"] = user.is_staff
+        self["is_admin"] = user.is_admin
+        self["is_superuser"] = user.is_superuser
+
+    def blacklist(self):
+        from .revocation import revoke_token
+
+        revoke_token(self[api_settings.JTI_CLAIM], self["exp"])
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_role_claims(user)
+        return token
+
+
+class ActionTokenPurposes:
+    VERIFY = "verify"
+    RESET = "reset"
+
+
+def _action_token_version(user, purpose):
+    """
+    A digest of the user state an action token is only valid for.
+
+    Verifying the email (or changing it) invalidates verification tokens, and
+    changing the password invalidates reset tokens, so a used token stays
+    unusable even after its denylist entry has been evicted.
+    """
+    if purpose == ActionTokenPurposes.VERIFY:
+        state = f"{user.pk}:{user.email}:{user.is_verified}"
+    else:
+        state = f"{user.pk}:{user.password}"
+    return salted_hmac(f"action-token:{purpose}", state).hexdigest()[:16]
+
+
+def _used_key(token_id):
+    return f"action-token:used:{token_id}"
+
+
+def make_action_token(user, purpose):
+    """Returns a signed, single-use token for an email verification or reset link."""
+    payload = {
+        "id": user.pk,
+        "purpose": purpose,
+        "v": _action_token_version(user, purpose),
+        "jti": secrets.token_urlsafe(9),
+        "exp": int(time.time()) + int(
+            settings.ACTION_TOKEN_LIFETIMES[purpose].total_seconds()
+        ),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+
+def consume_action_token(token, purpose, use):
+    """
+    Checks an action token, applies it with `use(user)` and returns the user.
+
+    Tampered, expired and wrong-purpose tokens, and tokens already in the
+    used-token denylist, are rejected before the database is touched. The
+    user row is then locked and the token checked against its current state;
+    `use` must change that state (see _action_token_version), which is what
+    keeps the token from being used twice across processes. The denylist
+    lives in the default cache, which may be per process: it is claimed only
+    once the checks pass, in the same transaction as `use`, and released if
+    that transaction fails, so a failed write leaves the link usable.
+
+    Raises:
+        ValueError: With a message fit for the user if the token is not valid.
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=["HS256"],
+            options={"require": ["exp", "jti", "purpose", "v", "id"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise ValueError("This link has expired. Please request a new one.")
+    except jwt.InvalidTokenError:
+        raise ValueError("Invalid link. Please request a new one.")
+    if payload["purpose"] != purpose:
+        raise ValueError("Invalid link. Please request a new one.")
+    used_key = _used_key(payload["jti"])
+    if cache.get(used_key) is not None:
+        raise ValueError("This link has already been used.")
+
+    claimed = False
+    try:
+        with transaction.atomic():
+            user = (
+                get_user_model()
+                .objects.select_for_update()
+                .filter(pk=payload["id"])
+                .first()
+            )
+            if user is None or payload["v"] != _action_token_version(user, purpose):
+                raise ValueError(
+                    "This link is no longer valid. Please request a new one."
+                )
+            remaining = max(payload["exp"] - int(time.time()), 1)
+            if not cache.add(used_key, 1, timeout=remaining):
+                raise ValueError("This link has already been used.")
+            claimed = True
+            use(user)
+    except Exception:
+        if claimed:
+            cache.delete(used_key)
+        raise
+    return user
@@ -9,6 +9,11 @@ urlpatterns = [
         views.StudentRegisterView.as_view(),
         name="register-student",
     ),
+    path(
+        "students/import/",
+        views.StudentImportView.as_view(),
+        name="student-import",
+    ),
     path(
         "verify/<str:token>/",
         views.AccountVerificationView.as_view(),
@@ -32,11 +37,49 @@ urlpatterns = [
     ),
     path("register-tutor/", views.TutorRegisterView.as_view(), name="register-tutor"),
     path("all-users/", views.UserListView.as_view(), name="all-users"),
+    path("users/search/", views.UserSearchView.as_view(), name="user-search"),
+    path(
+        "users/bulk-approve/",
+        views.BulkUserUpdateView.as_view(
+            changes={"is_approved": True},
+            action_message="Users approved successfully.",
+        ),
+        name="users-bulk-approve",
+    ),
+    path(
+        "users/bulk-verify/",
+        views.BulkUserUpdateView.as_view(
+            changes={"is_verified": True},
+            action_message="Users verified successfully.",
+        ),
+        name="users-bulk-verify",
+    ),
+    path(
+        "users/bulk-deactivate/",
+        views.BulkUserUpdateView.as_view(
+            changes={"is_active": False},
+            action_message="Users deactivated successfully.",
+        ),
+        name="users-bulk-deactivate",
+    ),
+    path(
+        "users/bulk-activate/",
+        views.BulkUserUpdateView.as_view(
+            changes={"is_active": True},
+            action_message="Users activated successfully.",
+        ),
+        name="users-bulk-activate",
+    ),
     path(
         "students/<int:pk>/",
         views.StudentUserDetailView.as_view(),
         name="student-detail",
     ),
+    path(
+        "students/<int:pk>/account/",
+        views.StudentAccountView.as_view(),
+        name="student-account",
+    ),
     path(
         "tutors/<int:pk>/", views.StudentUserDetailView.as_view(), name="tutor-detail"
     ),
@@ -55,6 +98,7 @@ urlpatterns = [
         views.RefreshTokenView.as_view(),
         name="refresh-token",
     ),
+    path("logout/", views.LogoutView.as_view(), name="logout"),
     path(
         "google-signin/",
         views.GoogleSignInView.as_view(),
@@ -1,62 +1,86 @@
-import jwt
+import functools
 
-from authlib.integrations.django_client import OAuth
 from django.conf import settings
-from django.core.mail import send_mail
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
 from django.urls import reverse
 
-from core.utils import EmailThread
+from core.utils import dispatch_bulk_email, dispatch_email, render_email, render_emails
+
+from .enums import UserTypes
+from .models import User, StudentProfile
+from .search import index_users
+from .tokens import ActionTokenPurposes
+
+
+@functools.cache
+def get_google_client():
+    """
+    Returns the Google OAuth client, registered on first use in the process.
+
+    Authlib is only imported here, so processes that never sign anyone in with
+    Google, such as management commands, do not pay for it at startup.
+    """
+    from .oauth import PooledOAuth
+
+    google_config = settings.AUTHLIB_OAUTH_CLIENTS["google"]
+    if not google_config["client_id"] or not google_config["client_secret"]:
+        raise ImproperlyConfigured(
+            "GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET must be set to sign in with Google."
+        )
+    return PooledOAuth().register(
+        name="google",
+        client_id=google_config["client_id"],
+        client_secret=google_config["client_secret"],
+        authorize_url=google_config["authorize_url"],
+        authorize_params=google_config["authorize_params"],
+        access_token_url=google_config["access_token_url"],
+        access_token_params=google_config["access_token_params"],
+        client_kwargs=google_config["client_kwargs"],
+        jwks_uri=google_config["jwks_uri"],
+        userinfo_endpoint=google_config["userinfo_endpoint"],
+    )
 
-oauth = OAuth()
 
-google_config = settings.AUTHLIB_OAUTH_CLIENTS["google"]
-oauth.register(
-    name="google",
-    client_id=google_config["client_id"],
-    client_secret=google_config["client_secret"],
-    authorize_url=google_config["authorize_url"],
-    authorize_params=google_config["authorize_params"],
-    access_token_url=google_config["access_token_url"],
-    access_token_params=google_config["access_token_params"],
-    client_kwargs=google_config["client_kwargs"],
-    jwks_uri=google_config["jwks_uri"],
-)
+async def fetch_google_profile(request):
+    """
+    Exchanges the callback's code for tokens and returns the user's profile.
 
+    The profile comes from the ID token in the token response, verified
+    locally against Google's cached signing keys. The userinfo endpoint is
+    only called when the ID token lacks the email or name. Both calls are
+    made without blocking the event loop.
+    """
+    from .oauth import async_http_client
 
-def decode_token(token):
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-    except jwt.ExpiredSignatureError:
-        raise ValueError("Token has expired")
-    except jwt.InvalidTokenError:
-        raise ValueError("Invalid token")
-    return payload
+    google = get_google_client()
+    issuers = settings.AUTHLIB_OAUTH_CLIENTS["google"]["issuers"]
+    async with async_http_client(request) as client:
+        token = await google.aauthorize_access_token(
+            request,
+            client,
+            claims_options={"iss": {"essential": True, "values": issuers}},
+        )
+        profile = token.get("userinfo")
+        if not profile or not {"email", "given_name"} <= profile.keys():
+            profile = await google.auserinfo(token, client)
+    return profile
 
 
 def send_verification_email(verification_link, user) -> None:
     subject = "Circle of Learning, MSSNUI  - Verify your email"
-    message = (
-        f"Assalaamu 'alaykum {user.first_name},\n\n"
-        f"Please verify your email by clicking on the link below:\n\n"
-        f"{verification_link}\n\n"
-        f"This link will expire in 24 hours.\n\n"
-        f"If you did not register for an account, please ignore this email.\n\n"
-        f"Best regards,\nCOL MSSNUI"
-    )
-    html_message = (
-        f"<p>Assalaamu 'alaykum {user.first_name},</p>"
-        f"<p>Your Account is successfully created. Please verify your email by clicking on the link below:</p>"
-        f"<p><a href='{verification_link}'>Verify Email</a></p>"
-        f"<p>This link will expire in 24 hours.</p>"
-        f"<p>If you did not register for an account, please ignore this email.</p>"
-        f"<p>Best regards,<br>COL MSSNUI</p>"
+    message, html_message = render_email(
+        "verify_email",
+        {"first_name": user.first_name, "verification_link": verification_link},
     )
     recipients = [user.email]
-    EmailThread(subject, message, html_message, recipients).start()
+    dispatch_email(subject, message, html_message, recipients)
 
 
 def send_verification(user, request) -> None:  # TODO: add error logging
-    token = user.generate_jwt_token()
+    token = user.generate_action_token(ActionTokenPurposes.VERIFY)
     verification_link = request.build_absolute_uri(
         reverse("users:verify-email", kwargs={"token": token})
     )
@@ -65,80 +89,160 @@ def send_verification(user, request) -> None:  # TODO: add error logging
 
 def send_reset_password_email(password_reset_link, user) -> None:
     subject = "Circle of Learning, MSSNUI - Reset your password"
-    message = f"Assalaamu 'alaykum, {user.first_name},\n\nYou requested a password reset. Please reset your password by clicking on the link below:\n\n{password_reset_link}\n\n This link will expire in 24 hours.\n\nIf you did not request a password reset, please ignore this email.\n\nBest regards,\nEcoVanguard Club"
-    html_message = f"<p>Assalaamu 'alaykum, {user.first_name},</p><p>You requested a password reset. Please reset your password by clicking on the link below:</p><p><a href='{password_reset_link}'>Reset Password</a></p><p>This link will expire in 24 hours.</p><p>If you did not request a password reset, please ignore this email.</p><p>Best regards,<br>EcoVanguard Club</p>"
+    message, html_message = render_email(
+        "reset_password",
+        {"first_name": user.first_name, "password_reset_link": password_reset_link},
+    )
     recipients = [user.email]
-    EmailThread(subject, message, html_message, recipients).start()
+    dispatch_email(subject, message, html_message, recipients)
 
 
 def send_reset_password(user) -> None:
-    token = user.generate_jwt_token()
+    token = user.generate_action_token(ActionTokenPurposes.RESET)
     password_reset_link = f"{settings.RESET_PASSWORD_REDIRECT_URL}?token={token}"
     send_reset_password_email(password_reset_link, user)
 
 
 def send_tutor_account_created_email(user, validated_data):
-    html_message = f"""
-            <p>Dear Ustaadh {user.first_name},</p>
-
-            <p>Assalaamu 'alaykum</p>
-
-            <p>Your tutor account has been created successfully.</p>
-
-            <p>Your login credentials are:</p>
-            <ul>
-                <li>Email: {user.email}</li>
-                <li>Password: {validated_data['password']}</li>
-            </ul>
-
-            <p>Regards,</p>
-            <p>Admin</p>
-            """
-    send_mail(
+    message, html_message = render_email(
+        "tutor_account_created",
+        {
+            "first_name": user.first_name,
+            "email": user.email,
+            "password": validated_data["password"],
+        },
+    )
+    dispatch_email(
         subject="Circle of Learning, MSSNUI - Tutor Account Created",
-        message=(
-            f"Dear Ustaadh {user.first_name},\n\n"
-            "Assalaamu 'alaykum \n\n"
-            "Your tutor account has been created successfully.\n\n"
-            "Your login credentials are:\n"
-            f"Email: {user.email}\n"
-            f"Password: {validated_data['password']}\n\n"
-            "Regards,\n"
-            "Admin"
-        ),
-        from_email="Circle of Learning MSSNUI",
-        recipient_list=[user.email],
-        fail_silently=False,
+        message=message,
         html_message=html_message,
+        recipients=[user.email],
     )
 
 
 def send_student_profile_creation_email(student_profile):
-    # How write a function to send an email to the student with his profile detaails when his profile is created?
-    html_message = f"""
-            <p>Dear {student_profile.user.first_name},</p>
-
-            <p>Assalaamu 'alaykum</p>
+    message, html_message = render_email(
+        "student_profile_created",
+        {
+            "first_name": student_profile.user.first_name,
+            "student_id": student_profile.student_id,
+        },
+    )
+    dispatch_email(
+        subject="Circle of Learning, MSSNUI - Student Profile Created",
+        message=message,
+        html_message=html_message,
+        recipients=[student_profile.user.email],
+    )
 
-            <p>Your student profile has been created successfully.</p>
 
-            <p>Your student ID is: {student_profile.student_id}</p>
+def send_student_invitations(users):
+    """Emails each imported student a link to set their password."""
+    recipients = (
+        (
+            user.email,
+            {
+                "first_name": user.first_name,
+                "invite_link": f"{settings.RESET_PASSWORD_REDIRECT_URL}"
+                f"?token={user.generate_action_token(ActionTokenPurposes.RESET)}",
+            },
+        )
+        for user in users
+    )
+    messages = []
+    for email, message, html_message in render_emails("student_invite", recipients):
+        invitation = EmailMultiAlternatives(
+            subject="Circle of Learning, MSSNUI - Set up your account",
+            body=message,
+            from_email=f"Circle of Learning MSSNUI <{settings.DEFAULT_FROM_EMAIL}>",
+            to=[email],
+        )
+        invitation.attach_alternative(html_message, "text/html")
+        messages.append(invitation)
+    dispatch_bulk_email(messages)
+
+
+def import_students(rows):
+    """
+    Creates students and their profiles from validated import rows.
+
+    Existing emails and matric numbers are found with one query per table and
+    reported with the rows repeating them in the file. The remaining rows are
+    created with bulk_create. No password is hashed: accounts get an unusable
+    password and an invitation to set one is queued for after the commit.
+
+    Returns a (created_users, errors) tuple, where each error is a dict with the
+    1-based row number, the field and a message.
+    """
+    emails = {User.objects.normalize_email(row["email"]) for _, row in rows}
+    matric_nos = {row["matric_no"] for _, row in rows}
+    taken_emails = set(
+        User.objects.filter(email__in=emails).values_list("email", flat=True)
+    )
+    taken_matric_nos = set(
+        StudentProfile.objects.filter(matric_no__in=matric_nos).values_list(
+            "matric_no", flat=True
+        )
+    )
 
-            <p>Regards,</p>
-            <p>Admin</p>
-            """
-    send_mail(
-        subject="Circle of Learning, MSSNUI - Student Profile Created",
-        message=(
-            f"Dear {student_profile.user.first_name},\n\n"
-            "Assalaamu 'alaykum \n\n"
-            "Your student profile has been created successfully.\n\n"
-            f"Your student ID is: {student_profile.student_id}\n\n"
-            "Regards,\n"
-            "Admin"
-        ),
-        from_email="Circle of Learning MSSNUI",
-        recipient_list=[student_profile.user.email],
-        fail_silently=False,
-        html_message=html_message,
-    )
\ No newline at end of file
+    errors = []
+    accepted = []
+    for row_number, row in rows:
+        email = User.objects.normalize_email(row["email"])
+        if email in taken_emails:
+            errors.append(
+                {
+                    "row": row_number,
+                    "field": "email",
+                    "message": "A user with this email already exists.",
+                }
+            )
+            continue
+        if row["matric_no"] in taken_matric_nos:
+            errors.append(
+                {
+                    "row": row_number,
+                    "field": "matric_no",
+                    "message": "A student with this matriculation number already exists.",
+                }
+            )
+            continue
+        # Later rows repeating this email or matric number are reported too
+        taken_emails.add(email)
+        taken_matric_nos.add(row["matric_no"])
+        accepted.append((email, row))
+
+    unusable_password = make_password(None)
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=email,
+                    password=unusable_password,
+                    first_name=row.get("first_name"),
+                    last_name=row.get("last_name"),
+                    phone_number=row.get("phone_number"),
+                    user_type=UserTypes.STUDENT,
+                    is_verified=True,  # vetted by the admin importing them
+                    is_approved=True,
+                )
+                for email, row in accepted
+            ]
+        )
+        StudentProfile.objects.bulk_create(
+            [
+                StudentProfile(
+                    user=user,
+                    matric_no=row["matric_no"],
+                    student_id=f"COL/STU/{row['matric_no']}",
+                    faculty=row.get("faculty"),
+                    department=row.get("department"),
+                    level=row.get("level"),
+                    hall_of_residence=row.get("hall_of_residence"),
+                )
+                for user, (_, row) in zip(users, accepted)
+            ]
+        )
+        index_users(user.pk for user in users)
+        send_student_invitations(users)
+    return users, errors
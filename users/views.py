@@ -1,40 +1,68 @@
+import csv
+import io
 from urllib.parse import urlencode
 
-import jwt
-
 from django.conf import settings
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse
 from django.core.mail import send_mail
 from django.urls import reverse
+from django.views import View
 from django.http import Http404
 from django.shortcuts import redirect, get_object_or_404
-from django.utils.crypto import get_random_string
-from django.db import transaction
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 
 from rest_framework import generics
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import (
+    TokenBlacklistView,
+    TokenObtainPairView,
+    TokenRefreshView,
+)
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 # from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework import status
 
+from core.pagination import IdCursorPagination
 from core.permissions import IsAdminUser, IsStaffUser, IsStaffOrOwner
+from core.throttling import EmailTokenBucketThrottle, IPTokenBucketThrottle
+from core.utils import parse_bool_param
 from .models import User, StudentProfile
 from .serializers import (
     UserSerializer,
+    UserSearchResultSerializer,
     TutorUserSerializer,
     StudentProfileSerializer,
+    StudentProfileFilterSerializer,
+    StudentProfileListSerializer,
     StudentUserSerializer,
+    StudentImportSerializer,
+    StudentImportRowSerializer,
+    BulkUserActionSerializer,
+    StudentAccountSerializer,
     ResendVerificationEmailSerializer,
     PasswordResetSerializer,
     SetNewPasswordSerializer,
     TutorTokenObtainPairSerializer,
     StudentTokenObtainPairSerializer,
+    UserTokenRefreshSerializer,
+    LogoutSerializer,
+)
+from .utils import (
+    get_google_client,
+    fetch_google_profile,
+    send_verification,
+    send_reset_password,
+    import_students,
 )
-from .utils import oauth, decode_token, send_verification, send_reset_password
 from .enums import UserTypes, AuthProviders
+from .search import search_user_ids
+from .authentication import invalidate_cached_users
+from .tokens import ActionTokenPurposes, consume_action_token
+from .revocation import revoke_user_tokens
 
 
 # =============Student Registration========================
@@ -59,24 +87,26 @@ class StudentRegisterView(generics.CreateAPIView):
 
     serializer_class = StudentUserSerializer
 
-    @transaction.atomic()
     def post(self, request, *args, **kwargs):
         data = request.data.copy()
         data["user_type"] = UserTypes.STUDENT
         data["auth_provider"] = AuthProviders.EMAIL
         serializer = self.get_serializer(data=data)
-        email = request.data.get("email")
-        if User.objects.filter(email=email).exists():
-            return Response(
-                {
-                    "success": False,
-                    "message": "A user with this email already exists.",
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        send_verification(user, request)
+        # The email's UniqueValidator is the only lookup; the unique constraint
+        # catches registrations racing past it.
+        if not serializer.is_valid():
+            email_errors = serializer.errors.get("email", [])
+            if any(error.code == "unique" for error in email_errors):
+                return self.email_taken_response()
+            raise ValidationError(serializer.errors)
+        # Hash before opening the transaction so it is held only for the INSERT
+        password_hash = make_password(serializer.validated_data["password"])
+        try:
+            with transaction.atomic():
+                user = serializer.save(password_hash=password_hash)
+                send_verification(user, request)  # sent once the INSERT commits
+        except IntegrityError:
+            return self.email_taken_response()
 
         response = {
             "success": True,
@@ -84,6 +114,77 @@ class StudentRegisterView(generics.CreateAPIView):
         }
         return Response(response, status=status.HTTP_201_CREATED)
 
+    def email_taken_response(self):
+        return Response(
+            {
+                "success": False,
+                "message": "A user with this email already exists.",
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class StudentImportView(generics.GenericAPIView):
+    """
+    For admins to onboard a cohort of students from a CSV file.
+
+    The file must have a header row with at least `email` and `matric_no`, and may
+    include first_name, last_name, phone_number, faculty, department, level and
+    hall_of_residence. Valid rows are created in bulk and each new student is
+    emailed a link to set their password. Invalid or duplicate rows are skipped
+    and reported with their row number.
+    """
+
+    serializer_class = StudentImportSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            content = serializer.validated_data["file"].read().decode("utf-8-sig")
+        except UnicodeDecodeError:
+            return Response(
+                {"success": False, "message": "The file must be UTF-8 encoded CSV."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = []
+        errors = []
+        # Row 1 is the header, so data rows are numbered from 2 like a spreadsheet
+        for row_number, raw_row in enumerate(csv.DictReader(io.StringIO(content)), 2):
+            row = {
+                key.strip(): value.strip()
+                for key, value in raw_row.items()
+                if key and value and value.strip()
+            }
+            row_serializer = StudentImportRowSerializer(data=row)
+            if row_serializer.is_valid():
+                rows.append((row_number, row_serializer.validated_data))
+                continue
+            for field, messages in row_serializer.errors.items():
+                errors.extend(
+                    {"row": row_number, "field": field, "message": str(message)}
+                    for message in messages
+                )
+
+        users, import_errors = import_students(rows)
+        errors = sorted(errors + import_errors, key=lambda error: error["row"])
+        response = {
+            "success": not errors,
+            "message": (
+                "Students imported successfully."
+                if not errors
+                else "Students imported with some errors."
+            ),
+            "created": len(users),
+            "errors": errors,
+        }
+        return Response(
+            response,
+            status=status.HTTP_207_MULTI_STATUS if errors else status.HTTP_201_CREATED,
+        )
+
 
 class AccountVerificationView(generics.RetrieveAPIView):
     """
@@ -116,7 +217,7 @@ class AccountVerificationView(generics.RetrieveAPIView):
 
     def get_object(self):
         """
-        Decodes the token and gets the user object
+        Decodes the token, marks the user verified and returns it
 
         Returns:
             User: The User object if the token is valid and the user exists.
@@ -127,17 +228,16 @@ class AccountVerificationView(generics.RetrieveAPIView):
 
         token = self.kwargs.get("token")
         try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            user = User.objects.get(id=payload["id"])
-            return user
-        except jwt.ExpiredSignatureError:
-            raise Http404("Verification link has expired. Please request a new one.")
-        except jwt.InvalidTokenError:
-            raise Http404("Invalid token. Please request a new one.")
-        except User.DoesNotExist:
-            raise Http404("User does not exist.")
+            return consume_action_token(
+                token, ActionTokenPurposes.VERIFY, self.verify_user
+            )
+        except ValueError as e:
+            raise Http404(str(e))
+
+    def verify_user(self, user):
+        user.is_verified = True
+        user.save(update_fields=["is_verified"])
 
-    @transaction.atomic()
     def retrieve(self, request, *args, **kwargs):
         """
         Activates the user account
@@ -156,8 +256,6 @@ class AccountVerificationView(generics.RetrieveAPIView):
         # If not, user request.build_absolute_url
         try:
             user = self.get_object()
-            user.is_verified = True
-            user.save()
             user_data = self.serializer_class(user).data
             url = f'{redirect_url}?{urlencode({"success": True, "message": "user verified successfully", "tokens": user.get_tokens_for_user()})}'
             return HttpResponseRedirect(url)
@@ -181,13 +279,15 @@ class ResendVerificationEmailView(generics.GenericAPIView):
     """
 
     serializer_class = ResendVerificationEmailSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = "resend_verification"
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
         try:
-            user = User.objects.filter(email=email).first()
+            user = User.objects.get_by_email(email)
 
             if not user:
                 return Response(
@@ -233,6 +333,8 @@ class RequestPasswordResetView(generics.GenericAPIView):
     """
 
     serializer_class = PasswordResetSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = "password_reset"
 
     def post(self, request, *args, **kwargs):
         """
@@ -248,9 +350,9 @@ class RequestPasswordResetView(generics.GenericAPIView):
         - If the user does not exist or is not active, returns an error response with a message.
         """
         email = request.data.get("email")
-        user = User.objects.filter(email=email).first()
+        user = User.objects.get_by_email(email)
         if user:
-            if user.auth_provider != AuthProviders.EMAIL:
+            if user.primary_auth_provider != AuthProviders.EMAIL:
                 message = {
                     "success": False,
                     "message": "You did not sign up with email and password",
@@ -282,22 +384,24 @@ class ResetPasswordView(generics.GenericAPIView):
 
     serializer_class = SetNewPasswordSerializer
 
-    @transaction.atomic()
     def patch(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         token = request.data.get("token")
         password = serializer.validated_data["password"]
-        try:
-            payload = decode_token(token)
-            user = User.objects.get(pk=payload["id"])
+
+        def reset_password(user):
             user.set_password(password)
-            user.save()
-            response = {"success": True, "message": "Password reset successful."}
-            return Response(response, status=status.HTTP_200_OK)
+            user.save(update_fields=["password"])
+            revoke_user_tokens([user.pk])
+
+        try:
+            consume_action_token(token, ActionTokenPurposes.RESET, reset_password)
         except ValueError as e:
             response = {"success": False, "message": str(e)}
-            return Response()
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        response = {"success": True, "message": "Password reset successful."}
+        return Response(response, status=status.HTTP_200_OK)
 
 
 # ==============Student Login=============
@@ -314,14 +418,14 @@ class GoogleSignInView(APIView):
     """
 
     def get(self, request):
-        google = oauth.create_client("google")
+        google = get_google_client()
         redirect_url = request.build_absolute_uri(
             reverse("users:google-signin-callback")
         )
         return google.authorize_redirect(request, redirect_url)
 
 
-class GoogleSignInCallbackView(APIView):
+class GoogleSignInCallbackView(View):
     """
     View for handling the Google sign-in callback.
 
@@ -332,12 +436,14 @@ class GoogleSignInCallbackView(APIView):
     If the user already exists, the view generates a new access token and refresh token for the user.
     Else, it creates a new user account and redirects the user to the appropriate URL.
 
+    The view is async: while it waits on Google, an ASGI worker can serve other requests.
+
     Methods:
         - get: Handles the GET request for the Google sign-in callback.
 
     """
-    @transaction.atomic()
-    def get(self, request):
+
+    async def get(self, request):
         """
         Handles the GET request for the Google sign-in callback.
 
@@ -349,14 +455,9 @@ class GoogleSignInCallbackView(APIView):
 
         """
         try:
-            token = oauth.google.authorize_access_token(request)
-            resp = oauth.google.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo", token=token
-            )
-            resp.raise_for_status()
-            profile = resp.json()
+            profile = await fetch_google_profile(request)
         except Exception as e:
-            return Response(
+            return JsonResponse(
                 {
                     "success": False,
                     "message": "An error occurred while fetching user profile from Google.",
@@ -365,7 +466,7 @@ class GoogleSignInCallbackView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user = User.objects.filter(email=profile["email"]).first()
+        user = await User.objects.aget_by_email(profile["email"])
         if user:
             if not user.primary_auth_provider == AuthProviders.GOOGLE:
                 # User signed up with email and password, but trying to sign in with Google
@@ -373,26 +474,25 @@ class GoogleSignInCallbackView(APIView):
                 linked_providers = set(user.all_linked_providers)
                 linked_providers.add(AuthProviders.GOOGLE)
                 user.linked_auth_providers = list(linked_providers)
-                user.save(update_fields=["linked_auth_providers"])
-            
+                await user.asave(update_fields=["linked_auth_providers"])
+
             tokens = user.get_tokens_for_user()
             redirect_url = f"{settings.GOOGLE_SIGNIN_REDIRECT_URL}?{urlencode({'success': True, 'message': 'Login successful.', 'tokens': tokens})}"
             return HttpResponseRedirect(redirect_url)
-        
+
         else:
-            # for a new user
-            password = get_random_string(10)
-            user = User.objects.create_user(
-                email=profile["email"],
-                password=password,
+            # for a new user; Google accounts get an unusable password, so no hashing.
+            # acreate skips create_user, so normalise the email here.
+            user = await User.objects.acreate(
+                email=User.objects.normalize_email(profile["email"]),
+                password=make_password(None),
                 primary_auth_provider=AuthProviders.GOOGLE,
                 linked_auth_providers=[AuthProviders.GOOGLE],
                 user_type=UserTypes.STUDENT,
                 first_name=profile["given_name"],
-                last_name=profile["family_name"],
+                last_name=profile.get("family_name"),
                 is_verified=True,
             )
-            user.save()
             tokens = user.get_tokens_for_user()
             redirect_url = f"{settings.GOOGLE_SIGNIN_REDIRECT_URL}?{urlencode({'success': True, 'message': 'Registration Successful', 'tokens': tokens})}"
             return HttpResponseRedirect(redirect_url)
@@ -404,6 +504,8 @@ class StudentLoginView(TokenObtainPairView):
     """
 
     serializer_class = StudentTokenObtainPairSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = "login"
 
 
 # =============Tutor Registration========================
@@ -446,6 +548,8 @@ class TutorLoginView(TokenObtainPairView):
     """
 
     serializer_class = TutorTokenObtainPairSerializer
+    throttle_classes = [IPTokenBucketThrottle, EmailTokenBucketThrottle]
+    throttle_scope = "login"
 
 # ===============Student Profile========================
 
@@ -453,10 +557,10 @@ class StudentProfileView(generics.ListCreateAPIView):
     """
     View for creating and listing student profiles.
 
-    This view allows administrators, tutors, or the owner of a student instance to create and list student profiles.
+    This view allows staff to list student profiles, and students to create their own profile.
 
     Methods:
-    - get: Retrieves a list of student profiles.
+    - get: Retrieves a page of student profiles.
     - post: Creates a new student profile.
 
     """
@@ -464,20 +568,59 @@ class StudentProfileView(generics.ListCreateAPIView):
     serializer_class = StudentProfileSerializer
     queryset = StudentProfile.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = IdCursorPagination
+    filters = {
+        "faculty": "faculty",
+        "department": "department",
+        "level": "level",
+        "hall": "hall_of_residence",
+        "student_class": "student_class",
+    }
+
+    def get_permissions(self):
+        if self.request.method == "GET":
+            return [IsStaffUser()]
+        return super().get_permissions()
+
+    def get_serializer_class(self):
+        if self.request.method == "GET":
+            return StudentProfileListSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        params = {
+            param: self.request.query_params[param]
+            for param in self.filters
+            if self.request.query_params.get(param)
+        }
+        filter_serializer = StudentProfileFilterSerializer(data=params)
+        filter_serializer.is_valid(raise_exception=True)
+        queryset = StudentProfile.objects.select_related("user", "student_class")
+        for param, value in filter_serializer.validated_data.items():
+            queryset = queryset.filter(**{self.filters[param]: value})
+        return queryset
 
     def get(self, request, *args, **kwargs):
         """
-        Retrieves a list of student profiles.
+        Retrieves a page of student profiles, with each student's name and email.
+
+        Profiles can be filtered by faculty, department, level, hall (hall of
+        residence) and student_class (a class ID). Pages are navigated with the
+        `next` and `previous` links; `page_size` sets the number of profiles per page.
+
+        Example:
+        GET /student-profile/?faculty=Science&level=300
 
         Returns:
-            A response containing the list of student profiles and a success message.
+            A response containing a page of student profiles and a success message.
         """
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
         response = {
             "success": True,
             "message": "Student profiles retrieved successfully.",
-            "data": serializer.data,
+            "data": self.paginator.get_paginated_data(serializer.data),
         }
         return Response(response, status=status.HTTP_200_OK)
 
@@ -564,6 +707,45 @@ class StudentUserProfile(generics.RetrieveUpdateDestroyAPIView):
         }
         return Response(response, status=status.HTTP_200_OK)
 
+class StudentAccountView(generics.RetrieveAPIView):
+    """
+    A student's account, profile and class summary in a single query.
+
+    Optional sections can be requested with a comma separated `include`:
+    - courses: the courses of the student's class in the active session
+    - results: the student's results in the active session
+
+    Example:
+    GET /students/12/account/?include=courses,results
+    """
+
+    serializer_class = StudentAccountSerializer
+    queryset = User.objects.select_related(
+        "studentprofile__student_class__class_tutor"
+    )
+    permission_classes = [IsAuthenticated, IsStaffOrOwner]
+    include_options = ("courses", "results")
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        requested = self.request.query_params.get("include", "")
+        context["include"] = {
+            option.strip()
+            for option in requested.split(",")
+            if option.strip() in self.include_options
+        }
+        return context
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(self.get_object())
+        response = {
+            "success": True,
+            "message": "Student account retrieved successfully.",
+            "data": serializer.data,
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+
 class UserListView(
     generics.ListAPIView
 ):  # Is this really necessary? since there is an enpoint for each user type
@@ -572,57 +754,144 @@ class UserListView(
     Attributes:
         queryset (QuerySet): The queryset of User objects.
         serializer_class (Serializer): The serializer class for User objects.
+        pagination_class: Keyset pagination, so every page costs the same.
 
     Methods:
         get_queryset(): Returns the filtered queryset based on the provided filters.
-        get(request, *args, **kwargs): Retrieves a list of users based on the provided filters.
+        get(request, *args, **kwargs): Retrieves a page of users based on the provided filters.
     """
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsStaffUser]
+    pagination_class = IdCursorPagination
+    boolean_filters = ("is_verified", "is_approved", "paid_reg", "is_active")
 
     def get_queryset(self):
-        user_type = self.request.query_params.get("user_type", None)
-        is_approved = self.request.query_params.get("is_approved", None)
-        if user_type is not None:
-            queryset = User.objects.filter(is_verified=True).filter(user_type=user_type)
-        if is_approved is not None:
-            queryset = queryset = User.objects.filter(is_verified=True).filter(
-                is_approved=is_approved
-            )
-        else:
-            queryset = User.objects.all()
+        params = self.request.query_params
+        queryset = User.objects.all()
+
+        user_type = params.get("user_type")
+        if user_type:
+            queryset = queryset.filter(user_type=user_type.upper())
+        for name in self.boolean_filters:
+            value = parse_bool_param(params, name)
+            if value is not None:
+                queryset = queryset.filter(**{name: value})
+        student_class = params.get("student_class")
+        if student_class:
+            queryset = queryset.filter(studentprofile__student_class=student_class)
         return queryset
 
     def get(self, request, *args, **kwargs):
         """
-        Retrieve a list of users based on the provided filters.
+        Retrieve a page of users based on the provided filters.
 
-        Users can be filtered by user_type or is_approved.
-        Only users whose emails are verified are included in the list.
+        Users can be filtered by user_type, is_verified, is_approved, paid_reg,
+        is_active and student_class (a class ID). Pages are navigated with the
+        `next` and `previous` links; `page_size` sets the number of users per page.
 
 
         Example:
         To retrieve a list of all students:
         GET /all-users/?user_type=student
 
-        To retrieve a list of all verified students:
-        GET /all-users/?user_type=student&is_approved=true
+        To retrieve a list of all verified, approved students:
+        GET /all-users/?user_type=student&is_verified=true&is_approved=true
 
         Returns:
-            A response containing the list of users and a success message.
+            A response containing a page of users and a success message.
         """
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = {
+            "success": True,
+            "message": "Users retrieved successfully.",
+            "data": self.paginator.get_paginated_data(serializer.data),
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+
+class UserSearchView(generics.GenericAPIView):
+    """
+    Searches users by partial name, email, matric number or student ID.
+
+    Every word of `q` must match the start of a word in one of those fields.
+    Results are ranked best match first and capped at `limit` (default 20, max 100).
+
+    Example:
+    GET /users/search/?q=ibra 2145
+    """
+
+    serializer_class = UserSearchResultSerializer
+    permission_classes = [IsStaffUser]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+        except ValueError:
+            limit = 20
+        user_ids = search_user_ids(query, limit=limit) if query else []
+        users = User.objects.select_related("studentprofile").in_bulk(user_ids)
+        serializer = self.get_serializer(
+            [users[pk] for pk in user_ids if pk in users], many=True
+        )
         response = {
-            "success:": True,
+            "success": True,
             "message": "Users retrieved successfully.",
             "data": serializer.data,
         }
         return Response(response, status=status.HTTP_200_OK)
 
 
+class BulkUserUpdateView(generics.GenericAPIView):
+    """
+    Applies one change to many users with a single UPDATE.
+
+    Each URL binds this view to one change through `changes`, e.g. approving or
+    deactivating. Users are selected by `ids` and/or the user_type, student_class
+    and level filters; the requesting admin is never included.
+
+    Example:
+    {
+        "student_class": 3,
+        "level": "400"
+    }
+    """
+
+    serializer_class = BulkUserActionSerializer
+    permission_classes = [IsAdminUser]
+    changes = {}
+    action_message = "Users updated successfully."
+
+    @transaction.atomic()
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids = list(
+            serializer.get_queryset()
+            .exclude(pk=request.user.pk)
+            .values_list("pk", flat=True)
+        )
+        # Filters can select any number of users, so update them in batches
+        batch_size = settings.BULK_USER_ACTION_BATCH_SIZE
+        updated = 0
+        for start in range(0, len(user_ids), batch_size):
+            batch = user_ids[start : start + batch_size]
+            updated += User.objects.filter(pk__in=batch).update(**self.changes)
+        if self.changes.get("is_active") is False:
+            revoke_user_tokens(user_ids)
+        transaction.on_commit(lambda: invalidate_cached_users(user_ids))
+        response = {
+            "success": True,
+            "message": self.action_message,
+            "data": {"updated": updated},
+        }
+        return Response(response, status=status.HTTP_200_OK)
+
+
 class StudentUserDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a user instance.
@@ -830,11 +1099,16 @@ class RefreshTokenView(TokenRefreshView):
     This view extends the `TokenRefreshView` class provided by the Django Rest Framework SimpleJWT library.
     It handles the POST request to refresh an existing authentication token and returns a new token.
 
+    Refresh tokens are rotated: the response carries a new refresh token and the
+    one sent is revoked, so it cannot be used again.
+
     Methods:
     - post: Handles the POST request to refresh the token and returns the new token.
 
     """
 
+    serializer_class = UserTokenRefreshSerializer
+
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         tokens = {
@@ -843,3 +1117,19 @@ class RefreshTokenView(TokenRefreshView):
             "tokens": response.data,
         }
         return Response(tokens, status=status.HTTP_200_OK)
+
+
+class LogoutView(TokenBlacklistView):
+    """
+    Logs the user out by revoking the given refresh token.
+
+    Methods:
+    - post: Revokes the refresh token in the request body.
+    """
+
+    serializer_class = LogoutSerializer
+
+    def post(self, request, *args, **kwargs):
+        super().post(request, *args, **kwargs)
+        response = {"success": True, "message": "Logged out successfully."}
+        return Response(response, status=status.HTTP_200_OK)